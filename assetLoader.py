@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg')
+
+
+class AssetHandle:
+    """Stand-in returned immediately for an asset that is loaded in the background"""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = None
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def ready(self):
+        """True once the asset loaded successfully"""
+        return self.done.is_set() and self.error is None
+
+    def get(self, default=None):
+        """The loaded asset, or default while it is still loading (or if it failed)"""
+        if self.ready:
+            return self.value
+        return default
+
+    def wait(self, timeout=None):
+        """Block until loading finished; returns the asset or None"""
+        self.done.wait(timeout)
+        return self.value
+
+
+class AssetLoader:
+    """Runs asset loading functions on a worker thread and hands out handles"""
+
+    def __init__(self, workers=1):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asset-loader')
+
+    def load(self, name, loader, *args, on_ready=None):
+        """Queue loader(*args); on_ready(handle) runs on the worker once it succeeds"""
+        handle = AssetHandle(name)
+
+        def run():
+            try:
+                handle.value = loader(*args)
+            except Exception as e:
+                handle.error = e
+                print(f"Failed to load {name}: {e}")
+            handle.done.set()
+            if handle.error is None and on_ready:
+                on_ready(handle)
+
+        self.executor.submit(run)
+        return handle
+
+    def shutdown(self, wait=False):
+        """Stop the worker, dropping anything not started yet"""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def build_audio_manifest(assets_dir):
+    """Music paths and sound-effect paths by name, from assets/manifest.json or a directory scan
+
+    A manifest file looks like {"music": ["music/a.mp3"], "sounds": {"win": "sounds/win.wav"}}
+    with paths relative to assets_dir.
+    """
+    manifest_path = os.path.join(assets_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        return {
+            'music': [os.path.join(assets_dir, path) for path in manifest.get('music', [])],
+            'sounds': {name: os.path.join(assets_dir, path) for name, path in manifest.get('sounds', {}).items()}
+        }
+
+    manifest = {'music': [], 'sounds': {}}
+    music_dir = os.path.join(assets_dir, 'music')
+    if os.path.isdir(music_dir):
+        for entry in sorted(os.scandir(music_dir), key=lambda entry: entry.name):
+            if entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                manifest['music'].append(entry.path)
+
+    sfx_dir = os.path.join(assets_dir, 'sounds')
+    if os.path.isdir(sfx_dir):
+        for entry in sorted(os.scandir(sfx_dir), key=lambda entry: entry.name):
+            if entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                manifest['sounds'][os.path.splitext(entry.name)[0]] = entry.path
+    return manifest
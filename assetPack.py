@@ -0,0 +1,126 @@
+"""Packs every sprite, already decoded and scaled, into one archive the game memory-maps.
+
+Run after changing any image:
+    python assetPack.py                  # writes assets/sprites.pack
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+MAGIC = b'SPRPACK1'
+HEADER = struct.Struct('<8sI')  # Magic, index length
+ALIGN = 16
+DEFAULT_PACK = os.path.join('assets', 'sprites.pack')
+
+# Every image at every size the game draws it
+SPRITES = [
+    ('assets/background.png', (800, 800)),
+    ('assets/character.png', (50, 50)),
+    ('assets/chest.png', (50, 50)),
+    ('assets/enemy.png', (50, 50)),
+    ('assets/enemy.png', (30, 30)),
+]
+
+
+def entry_key(image_path, width, height):
+    return f"{image_path}|{width}x{height}"
+
+
+def pack_assets(output=DEFAULT_PACK, sprites=SPRITES):
+    """Decode and scale each sprite and write the raw pixels plus a JSON index"""
+    index = {}
+    blobs = []
+    offset = 0
+    for image_path, (width, height) in sprites:
+        image = pygame.transform.scale(pygame.image.load(image_path), (width, height))
+        pixel_format = 'RGBA' if image.get_flags() & pygame.SRCALPHA else 'RGB'
+        data = pygame.image.tobytes(image, pixel_format)
+        colorkey = image.get_colorkey()
+        index[entry_key(image_path, width, height)] = {
+            'offset': offset,
+            'length': len(data),
+            'size': [width, height],
+            'format': pixel_format,
+            'colorkey': colorkey and list(colorkey),
+            'source_mtime': os.path.getmtime(image_path)
+        }
+        padding = -len(data) % ALIGN
+        blobs.append(data + b'\0' * padding)
+        offset += len(data) + padding
+
+    index_data = json.dumps(index).encode()
+    index_data += b' ' * (-(HEADER.size + len(index_data)) % ALIGN)  # Keep pixel data aligned
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(index_data)))
+        f.write(index_data)
+        for blob in blobs:
+            f.write(blob)
+    return len(index), HEADER.size + len(index_data) + offset
+
+
+class AssetPack:
+    """Read-only view of a sprite pack; surfaces are built straight from the mapped file"""
+
+    def __init__(self, path=DEFAULT_PACK):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a sprite pack")
+        self.index = json.loads(self.data[HEADER.size:HEADER.size + index_length])
+        self.data_start = HEADER.size + index_length
+
+        # Statistics
+        self.hits = 0
+        self.stale = 0  # Entries skipped because the source image changed after packing
+
+    @classmethod
+    def open(cls, path=DEFAULT_PACK):
+        """The pack at path, or None when there is none (or it can't be read)"""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring sprite pack {path}: {e}")
+            return None
+
+    def get(self, image_path, width, height):
+        """A surface for the packed sprite, or None if it isn't in the pack or is out of date"""
+        entry = self.index.get(entry_key(image_path, width, height))
+        if entry is None:
+            return None
+        try:
+            if os.path.getmtime(image_path) > entry['source_mtime']:
+                self.stale += 1
+                return None
+        except OSError:
+            pass  # Loose file gone: the pack is all there is
+        start = self.data_start + entry['offset']
+        pixels = memoryview(self.data)[start:start + entry['length']]
+        image = pygame.image.frombuffer(pixels, tuple(entry['size']), entry['format'])
+        if entry['colorkey']:
+            image.set_colorkey(entry['colorkey'])
+        self.hits += 1
+        return image
+
+    def close(self):
+        self.data.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the game's sprites into one pre-scaled archive")
+    parser.add_argument('-o', '--output', default=DEFAULT_PACK)
+    args = parser.parse_args()
+
+    count, size = pack_assets(args.output)
+    print(f"Packed {count} sprites into {args.output} ({size / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import threading
+import weakref
+
+import pygame
+
+
+class AudioService:
+    """Owns the mixer: initializes it once, streams music and keeps short sound effects decoded
+
+    Long tracks go through pygame.mixer.music, which decodes a little at a time. Only
+    sounds shorter than max_sfx_seconds stay in memory as PCM; anything longer is
+    refused so a full song never ends up decoded in RAM.
+    """
+
+    def __init__(self, frequency=44100, size=-16, channels=2, buffer=512, max_sfx_seconds=10,
+                 max_sfx_bytes=2 * 1024 * 1024):
+        self.settings = {'frequency': frequency, 'size': size, 'channels': channels, 'buffer': buffer}
+        self.max_sfx_seconds = max_sfx_seconds
+        self.max_sfx_bytes = max_sfx_bytes
+        self.sounds = {}  # Path -> Sound, each file decoded once
+        self.sound_bytes = weakref.WeakKeyDictionary()  # Sound -> decoded size, while it is alive
+        self.lock = threading.Lock()  # Sounds are also loaded from the asset loader thread
+        self.music_path = None
+
+    def init(self):
+        """Start the mixer if nobody has yet; returns False when there is no audio device"""
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.init(**self.settings)
+            return True
+        except pygame.error as e:
+            print(f"[WARNING] Could not initialize audio: {e}")
+            return False
+
+    def play_music(self, path, loops=-1, volume=1.0):
+        """Stream a track on the music channel; returns False if it can't be played"""
+        if not self.init():
+            return False
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops)
+            self.music_path = path
+            return True
+        except pygame.error as e:
+            print(f"[WARNING] Could not play background music: {e}")
+            return False
+
+    def stop_music(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+        self.music_path = None
+
+    def load_sound(self, path):
+        """Decode a short sound effect once; raises pygame.error for long tracks"""
+        sound = self.sounds.get(path)
+        if sound is not None:
+            return sound
+        self.init()
+        # Catch big files before decoding them at all; the length check covers the rest
+        if os.path.getsize(path) > self.max_sfx_bytes:
+            raise pygame.error(f"{os.path.basename(path)} is too big for a sound effect; "
+                               f"stream it with play_music instead")
+        sound = pygame.mixer.Sound(path)
+        if sound.get_length() > self.max_sfx_seconds:
+            raise pygame.error(f"{os.path.basename(path)} is {sound.get_length():.0f}s long; "
+                               f"stream it with play_music instead")
+        self.sounds[path] = sound
+        self.track(sound)
+        return sound
+
+    def make_sound(self, samples):
+        """Sound from a sample array (see pygame.sndarray), counted as resident"""
+        self.init()
+        return self.track(pygame.sndarray.make_sound(samples))
+
+    def track(self, sound):
+        """Count a decoded sound towards resident memory"""
+        frequency, size, channels = pygame.mixer.get_init()
+        samples = int(round(sound.get_length() * frequency))
+        with self.lock:
+            self.sound_bytes[sound] = samples * channels * abs(size) // 8
+        return sound
+
+    def quit(self):
+        """Drop every decoded sound and shut the mixer down"""
+        self.stop_music()
+        self.sounds.clear()
+        pygame.mixer.quit()
+
+    def get_stats(self):
+        """Mixer settings plus how much decoded audio the service holds"""
+        init = pygame.mixer.get_init()
+        with self.lock:
+            resident_bytes = sum(self.sound_bytes.values())
+        return {
+            'mixer': init and {'frequency': init[0], 'size': init[1], 'channels': init[2]},
+            'sound_files': len(self.sounds),
+            'resident_bytes': resident_bytes,
+            'music': self.music_path and os.path.basename(self.music_path)
+        }
+
+
+# The only place the mixer gets initialized
+audio = AudioService()
@@ -0,0 +1,167 @@
+"""Plays thousands of seeded, bot-driven headless games across all cores to check difficulty.
+
+Run with:
+    python balanceSimulator.py                   # 1000 games, one worker per core
+    python balanceSimulator.py -n 5000 -o balance.json
+    python balanceSimulator.py --start-level 4   # focus on the later levels
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+
+def init_worker():
+    """Each worker process gets its own headless pygame"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    pygame.display.init()
+    pygame.font.init()
+
+
+def bot_keys(game, dodge_distance=90, lookahead=10):
+    """Keys a simple player would hold: open the chest, grab the nearest item, bring it home,
+    stepping out of the way of enemies about to get close"""
+    player = game.player
+    x, y = player.x + player.width / 2, player.y + player.height / 2
+
+    target = game.treasure_box
+    if game.treasure_opened and game.items_collected < game.total_items and game.treasure_items:
+        target = min(game.treasure_items, key=lambda item: abs(item.x - player.x) + abs(item.y - player.y))
+    target_x, target_y = target.x + target.width / 2, target.y + target.height / 2
+
+    # Enemies patrol, chase and flock, so judge each one by where its velocity takes it
+    # over the next few ticks and back away from the most threatening one
+    threat = None
+    closest = dodge_distance
+    for enemy in game.enemies:
+        ahead_x = enemy.x + enemy.width / 2 + enemy.speed * game.motion_scale * lookahead
+        ahead_y = enemy.y + enemy.height / 2 + enemy.speed_y * game.motion_scale * lookahead
+        distance = min(math.hypot(ahead_x - x, ahead_y - y),
+                       math.hypot(enemy.x + enemy.width / 2 - x, enemy.y + enemy.height / 2 - y))
+        if distance < closest:
+            closest = distance
+            threat = (ahead_x, ahead_y)
+    if threat is not None:
+        target_x, target_y = 2 * x - threat[0], 2 * y - threat[1]
+
+    held = set()
+    if target_x > x + 5:
+        held.add(pygame.K_RIGHT)
+    elif target_x < x - 5:
+        held.add(pygame.K_LEFT)
+    if target_y > y + 5:
+        held.add(pygame.K_DOWN)
+    elif target_y < y - 5:
+        held.add(pygame.K_UP)
+    return held
+
+
+def simulate(seed, max_minutes=10, start_level=1, tick_rate=60):
+    """Play one game to game over (or max_minutes of game time); returns per-level results"""
+    from game import Game
+
+    game = Game(headless=True, seed=seed, tick_rate=tick_rate)
+    if start_level != 1:
+        game.current_level = start_level
+        game.setup_level()
+
+    levels = []
+    level = {'level': game.current_level, 'start_tick': game.tick_count, 'hits': 0}
+    max_ticks = game.ticks(max_minutes * 60)
+    while not game.game_over and game.tick_count < max_ticks:
+        lives = game.lives
+        game.step(bot_keys(game))
+        if game.lives < lives:
+            level['hits'] += 1
+        if game.current_level != level['level']:
+            level['cleared'] = True
+            level['seconds'] = (game.tick_count - level['start_tick']) / game.tick_rate
+            levels.append(level)
+            level = {'level': game.current_level, 'start_tick': game.tick_count, 'hits': 0}
+
+    level['cleared'] = False
+    level['seconds'] = (game.tick_count - level['start_tick']) / game.tick_rate
+    if game.lives <= 0:
+        level['end'] = 'enemies'
+    elif game.game_over:
+        level['end'] = 'time'
+    else:
+        level['end'] = 'simulation cap'
+    levels.append(level)
+    return {'seed': seed, 'score': game.score, 'final_level': game.current_level,
+            'ticks': game.tick_count, 'tick_rate': game.tick_rate, 'levels': levels}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def aggregate(results):
+    """Clear rate, time to clear and what ended the run, per level"""
+    report = {}
+    for result in results:
+        for level in result['levels']:
+            stats = report.setdefault(level['level'], {'reached': 0, 'cleared': 0, 'hits': 0, 'clear_seconds': [],
+                                                       'ended_by': {}})
+            stats['reached'] += 1
+            stats['hits'] += level['hits']
+            if level['cleared']:
+                stats['cleared'] += 1
+                stats['clear_seconds'].append(level['seconds'])
+            else:
+                stats['ended_by'][level['end']] = stats['ended_by'].get(level['end'], 0) + 1
+
+    for stats in report.values():
+        seconds = stats.pop('clear_seconds')
+        stats['clear_rate'] = stats['cleared'] / stats['reached']
+        stats['hits_per_attempt'] = stats['hits'] / stats['reached']
+        stats['median_clear_seconds'] = percentile(seconds, 0.5) if seconds else None
+        stats['p90_clear_seconds'] = percentile(seconds, 0.9) if seconds else None
+    return dict(sorted(report.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-simulate bot games to check the difficulty curve")
+    parser.add_argument('-n', '--games', type=int, default=1000)
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help="processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0, help="first seed; game i uses seed + i")
+    parser.add_argument('--max-minutes', type=float, default=10, help="game-time cap per game")
+    parser.add_argument('--start-level', type=int, default=1)
+    parser.add_argument('--tick-rate', type=int, default=60, help="simulation ticks per second of game time")
+    parser.add_argument('-o', '--output', help="write the report and per-game results to this JSON file")
+    args = parser.parse_args()
+
+    seeds = range(args.seed, args.seed + args.games)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as executor:
+        results = list(executor.map(simulate, seeds, [args.max_minutes] * args.games,
+                                    [args.start_level] * args.games, [args.tick_rate] * args.games,
+                                    chunksize=max(1, args.games // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    report = aggregate(results)
+    ticks = sum(result['ticks'] for result in results)
+    played = sum(result['ticks'] / result['tick_rate'] for result in results)
+    print(f"{args.games} games, {played / 3600:.1f} hours of play in {elapsed:.1f}s "
+          f"on {args.workers} workers ({ticks / elapsed:.0f} ticks/s)")
+    print(f"{'level':>5} {'reached':>8} {'clear %':>8} {'median s':>9} {'p90 s':>7} {'hits':>6}  ended by")
+    for level, stats in report.items():
+        median = f"{stats['median_clear_seconds']:.0f}" if stats['median_clear_seconds'] is not None else '-'
+        p90 = f"{stats['p90_clear_seconds']:.0f}" if stats['p90_clear_seconds'] is not None else '-'
+        ended_by = ', '.join(f"{cause} {count}" for cause, count in sorted(stats['ended_by'].items()))
+        print(f"{level:>5} {stats['reached']:>8} {stats['clear_rate'] * 100:>7.1f}% {median:>9} {p90:>7} "
+              f"{stats['hits_per_attempt']:>6.2f}  {ended_by}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'settings': vars(args), 'levels': report, 'games': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Scripted benchmarks for the game's update and draw hot paths.
+
+Run with:
+    python benchmark.py                          # all scenarios, print a summary
+    python benchmark.py -o results.json          # also save the results
+    python benchmark.py --baseline results.json  # flag regressions against a saved run
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from game import Game, KeyState
+
+
+NO_KEYS = KeyState()
+
+
+def make_game(seed):
+    """A headless game that won't end on its own during a benchmark"""
+    game = Game(headless=True, seed=seed)
+    game.lives = 10 ** 6
+    game.schedule_event('level_timeout', 10 ** 9)
+    return game
+
+
+def level_1_idle(seed):
+    return make_game(seed)
+
+
+def level_10_full_enemies(seed):
+    game = make_game(seed)
+    game.current_level = 10
+    game.setup_level()
+    game.schedule_event('level_timeout', 10 ** 9)
+    while len(game.enemies) < game.max_enemies:
+        game.spawn_new_enemy()
+    return game
+
+
+def shield_max_particles(seed):
+    game = make_game(seed)
+    game.power_up_active = True
+    game.schedule_event('power_up_end', 10 ** 9)
+    game.current_power_type = "shield"
+    game.current_power_color = (135, 206, 235)
+    game.particles_per_frame = 500  # ~20k particles alive at steady state
+    return game
+
+
+def treasure_items_500(seed):
+    game = make_game(seed)
+    game.open_treasure()
+    item_types = ["gem", "coin", "crown", "ruby"]
+    while len(game.treasure_items) < 500:
+        x = game.rng.randint(0, game.width - 30)
+        y = game.rng.randint(0, game.height - 30)
+        item = game.item_pool.acquire(x, y, 30, 30, 'assets/enemy.png', game.rng.choice(item_types),
+                                      world=game.world, rng=game.rng)
+        game.treasure_items.append(item)
+    game.player.x = game.player.y = 0  # Keep the player away from the items
+    return game
+
+
+def game_over_overlay(seed):
+    game = make_game(seed)
+    game.game_over = True
+    return game
+
+
+SCENARIOS = {
+    'level 1 idle': level_1_idle,
+    'level 10 full enemies': level_10_full_enemies,
+    'shield active with max particles': shield_max_particles,
+    '500 treasure items': treasure_items_500,
+    'game-over overlay': game_over_overlay,
+}
+
+
+def run_frame(game, timings):
+    """Run one real tick (the same calls as Game.step()) plus a draw, adding the time of
+    each phase marked on the game's profiler to timings"""
+    profiler = game.profiler
+    profiler.begin_frame()
+    game.save_previous()
+    game.handle_input(NO_KEYS)
+    profiler.mark('handle_input')
+    game.update()
+    game.draw_objects()
+    for phase, seconds in profiler.current.items():
+        timings.setdefault(phase, []).append(seconds)
+    profiler.end_frame()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_scenario(setup, frames, seed):
+    """Time every phase over a number of frames, then measure allocations separately"""
+    game = setup(seed)
+    timings = {}
+    frame_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        run_frame(game, timings)
+        frame_times.append(time.perf_counter() - start)
+
+    # tracemalloc slows everything down, so allocations get their own shorter pass
+    scratch = {}
+    allocated = []
+    tracemalloc.start()
+    for _ in range(min(frames, 60)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        run_frame(game, scratch)
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    result = {'phases': {}}
+    for name, values in timings.items():
+        if values:
+            result['phases'][name] = {
+                'median_ms': percentile(values, 0.5) * 1000,
+                'p99_ms': percentile(values, 0.99) * 1000
+            }
+    result['frame'] = {
+        'median_ms': percentile(frame_times, 0.5) * 1000,
+        'p99_ms': percentile(frame_times, 0.99) * 1000
+    }
+    result['peak_alloc_kb_per_frame'] = percentile(allocated, 0.5) / 1024
+    return result
+
+
+def compare(results, baseline, threshold):
+    """List phases whose median got slower than the baseline by more than threshold"""
+    regressions = []
+    for scenario, result in results['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(scenario)
+        if not old:
+            continue
+        for phase, timing in result['phases'].items():
+            old_timing = old['phases'].get(phase)
+            # Ignore phases too fast to time reliably
+            if not old_timing or old_timing['median_ms'] < 0.01:
+                continue
+            ratio = timing['median_ms'] / old_timing['median_ms']
+            if ratio > 1 + threshold:
+                regressions.append((scenario, phase, old_timing['median_ms'], timing['median_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's update and draw phases")
+    parser.add_argument('-n', '--frames', type=int, default=300, help="frames per scenario")
+    parser.add_argument('-s', '--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="only run this scenario (repeatable)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-o', '--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed slowdown of a phase median before it counts as a regression")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = {
+        'frames': args.frames,
+        'seed': args.seed,
+        'python': sys.version.split()[0],
+        'pygame': pygame.version.ver,
+        'scenarios': {}
+    }
+    for name in args.scenario or SCENARIOS:
+        result = run_scenario(SCENARIOS[name], args.frames, args.seed)
+        results['scenarios'][name] = result
+        print(f"{name}: frame median {result['frame']['median_ms']:.3f}ms, "
+              f"p99 {result['frame']['p99_ms']:.3f}ms, "
+              f"{result['peak_alloc_kb_per_frame']:.1f}KB allocated/frame")
+        for phase, timing in result['phases'].items():
+            print(f"    {phase:<15} median {timing['median_ms']:8.3f}ms   p99 {timing['p99_ms']:8.3f}ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for scenario, phase, old, new, ratio in regressions:
+            print(f"REGRESSION {scenario} / {phase}: {old:.3f}ms -> {new:.3f}ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compare the spatial grid broad phase with a plain linear collision scan.
+
+Run with: python collisionBenchmark.py
+"""
+import math
+import random
+import time
+from spatialGrid import SpatialGrid
+
+
+class Box:
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+
+def check_collision(obj1, obj2):
+    """Same AABB test as Game.check_collision"""
+    return (obj1.x < obj2.x + obj2.width and
+            obj1.x + obj1.width > obj2.x and
+            obj1.y < obj2.y + obj2.height and
+            obj1.y + obj1.height > obj2.y)
+
+
+def make_boxes(count, rng):
+    """Scatter 50x50 boxes, growing the arena so density stays like a busy level"""
+    side = max(800, int(800 * math.sqrt(count / 50)))
+    return [Box(rng.randint(0, side - 50), rng.randint(0, side - 50), 50, 50) for _ in range(count)], side
+
+
+def linear_single(player, boxes):
+    return sum(1 for box in boxes if check_collision(player, box))
+
+
+def grid_single(player, boxes, grid):
+    grid.rebuild(boxes)
+    return sum(1 for index in grid.query_object(player) if check_collision(player, boxes[index]))
+
+
+def linear_pairs(boxes):
+    hits = 0
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            if check_collision(boxes[i], boxes[j]):
+                hits += 1
+    return hits
+
+
+def grid_pairs(boxes, grid):
+    grid.rebuild(boxes)
+    return sum(1 for i, j in grid.candidate_pairs() if check_collision(boxes[i], boxes[j]))
+
+
+def time_call(function, *args, budget=0.5):
+    """Average milliseconds per call, repeating until the time budget is used"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        result = function(*args)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            return elapsed * 1000 / calls, result
+
+
+def main():
+    rng = random.Random(1)
+    grid = SpatialGrid()
+    print(f"{'entities':>8} | {'player linear':>13} | {'player grid':>11} | {'pairs linear':>12} | {'pairs grid':>10}")
+    for count in (10, 100, 1000, 10000):
+        boxes, side = make_boxes(count, rng)
+        player = Box(side // 2, side // 2, 50, 50)
+
+        single_linear, expected = time_call(linear_single, player, boxes)
+        single_grid, found = time_call(grid_single, player, boxes, grid)
+        assert found == expected
+
+        pair_grid, found = time_call(grid_pairs, boxes, grid)
+        if count <= 1000:
+            pair_linear, expected = time_call(linear_pairs, boxes)
+            assert found == expected
+            pair_linear = f"{pair_linear:10.3f}ms"
+        else:
+            pair_linear = "skipped"  # ~50M AABB tests, minutes of runtime
+
+        print(f"{count:>8} | {single_linear:11.3f}ms | {single_grid:9.3f}ms | {pair_linear:>12} | {pair_grid:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
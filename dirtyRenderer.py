@@ -0,0 +1,73 @@
+import pygame
+
+
+def merge_rects(rects):
+    """Merge overlapping rects so each screen area is only updated once"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Redraws and flips only the screen areas that changed since last frame"""
+
+    def __init__(self, surface, background):
+        self.surface = surface
+        self.background = background  # Full-window image used to erase old sprites
+        self.screen_rect = surface.get_rect()
+
+        self.previous_rects = []  # Everything drawn last frame
+        self.current_rects = []   # Everything drawn this frame
+        self.full_redraw = True   # First frame has to paint the whole window
+
+        # Statistics
+        self.frames = 0
+        self.updated_pixels = 0
+
+    def invalidate(self):
+        """Repaint the whole window on the next frame"""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        """Erase last frame's sprites by restoring the background under them"""
+        self.current_rects = []
+        if self.full_redraw:
+            self.surface.blit(self.background, (0, 0))
+            self.current_rects.append(self.screen_rect.copy())
+            self.full_redraw = False
+        else:
+            for rect in self.previous_rects:
+                self.surface.blit(self.background, rect, rect)
+
+    def add(self, rect):
+        """Record an area drawn this frame"""
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.current_rects.append(rect)
+
+    def end_frame(self):
+        """Push the old and new sprite areas to the display"""
+        # Old areas now show background and new areas show sprites, so both go out
+        dirty = merge_rects(self.previous_rects + self.current_rects)
+        pygame.display.update(dirty)
+
+        self.previous_rects = self.current_rects
+        self.frames += 1
+        self.updated_pixels += sum(rect.width * rect.height for rect in dirty)
+        return dirty
+
+    def get_stats(self):
+        """Get the average share of the window updated per frame"""
+        screen_pixels = self.screen_rect.width * self.screen_rect.height
+        average = self.updated_pixels / self.frames if self.frames else 0
+        return {
+            'frames': self.frames,
+            'average_pixels': average,
+            'average_fraction': average / screen_pixels
+        }
@@ -0,0 +1,219 @@
+import math
+import time
+
+import numpy as np
+
+from spatialGrid import SpatialGrid
+
+# Behaviours
+PATROL = 0  # Walk the row, turning around in front of other enemies
+CHASE = 1   # Head for the player, keeping some room from neighbours
+FLOCK = 2   # Stay with nearby flockmates (boids) while drifting towards the player
+BEHAVIOURS = ['patrol', 'chase', 'flock']
+
+
+class EnemyAI:
+    """Steering decisions for enemies, spread over frames within a per-frame time budget
+
+    Decisions only set an enemy's velocity (speed / speed_y in its EntityWorld slot);
+    EntityWorld.step() keeps moving everyone every tick, so an enemy whose decision
+    is put off just keeps going the way it was. Each tick the enemies that are due
+    are decided nearest-band first and, within a band, longest-waiting first. The
+    bands (lod) set how often an enemy is re-decided by its distance to the player.
+    Whatever doesn't fit in budget_ms stays due and goes first next tick.
+
+    The budget covers every tick run in one rendered frame, starting at begin_frame(),
+    so a frame catching up on several ticks doesn't get several budgets. Without
+    begin_frame() each update() gets its own budget.
+
+    With max_decisions set, the count replaces the clock so that recordings and
+    headless runs come out the same on any machine.
+    """
+
+    def __init__(self, world, budget_ms=1.0, max_decisions=None,
+                 lod=((150, 1), (350, 3), (None, 8)), neighbour_radius=100):
+        self.world = world
+        self.budget = budget_ms / 1000
+        self.max_decisions = max_decisions
+        self.band_limits = np.array([distance for distance, _ in lod[:-1]], dtype=np.float64)
+        self.intervals = [interval for _, interval in lod]  # Ticks between decisions per band
+        self.neighbour_radius = neighbour_radius
+        self.grid = SpatialGrid(cell_size=neighbour_radius)
+
+        # Per world slot
+        self.behaviour = np.zeros(0, dtype=np.int8)
+        self.max_speed = np.zeros(0, dtype=np.float64)
+        self.next_think = np.zeros(0, dtype=np.int64)  # Tick of the next decision
+
+        self.deadline = None  # End of the current frame's budget (perf_counter time)
+        self.frame_decisions = 0
+        self.frame_ms = 0.0  # AI time spent in the current frame
+
+        # Statistics
+        self.decisions = 0
+        self.deferred = 0  # Due decisions pushed to a later tick by the budget
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, slot, behaviour, next_think=0, max_speed=None):
+        """Start steering the entity in a world slot; its current speed becomes its top speed"""
+        if slot >= len(self.behaviour):
+            size = max(slot + 1, self.world.capacity)
+            for name in ('behaviour', 'max_speed', 'next_think'):
+                old = getattr(self, name)
+                new = np.zeros(size, dtype=old.dtype)
+                new[:len(old)] = old
+                setattr(self, name, new)
+        self.behaviour[slot] = behaviour
+        self.max_speed[slot] = max(1.0, abs(self.world.speed[slot])) if max_speed is None else max_speed
+        self.next_think[slot] = next_think
+
+    def begin_frame(self):
+        """Start a new rendered frame's budget"""
+        self.deadline = time.perf_counter() + self.budget
+        self.frame_decisions = 0
+        self.frame_ms = 0.0
+
+    def update(self, enemies, player, now):
+        """Make as many of the due decisions as the budget allows; returns how many were made"""
+        start = time.perf_counter()
+        if not enemies:
+            return 0
+        # This frame's budget is already spent; don't even gather the arrays
+        if (self.max_decisions is None and self.deadline is not None and self.frame_decisions
+                and start >= self.deadline):
+            return 0
+        world = self.world
+        slots = np.fromiter((enemy.slot for enemy in enemies), dtype=np.intp, count=len(enemies))
+        next_think = self.next_think[slots]
+        due = np.flatnonzero(next_think <= now)
+        if not due.size:
+            self.finish(start, 0)
+            return 0
+
+        width = world.width[slots]
+        height = world.height[slots]
+        center_x = world.x[slots] + width / 2
+        center_y = world.y[slots] + height / 2
+        player_x = player.x + player.width / 2
+        player_y = player.y + player.height / 2
+        band = np.searchsorted(self.band_limits, np.hypot(center_x - player_x, center_y - player_y), side='right')
+        order = due[np.lexsort((next_think[due], band[due]))]
+
+        self.grid.rebuild(enemies)
+        center_x = center_x.tolist()
+        center_y = center_y.tolist()
+        velocity_x = world.speed[slots].tolist()
+        velocity_y = world.speed_y[slots].tolist()
+        behaviour = self.behaviour[slots].tolist()
+        band = band.tolist()
+        slots = slots.tolist()
+        deadline = self.deadline if self.deadline is not None else start + self.budget
+        frame_decisions = self.frame_decisions if self.deadline is not None else 0
+
+        decided = 0
+        for index in order.tolist():
+            if self.max_decisions is not None:
+                if decided >= self.max_decisions:
+                    break
+            # At least one decision per frame, however slow, so nobody waits forever
+            elif frame_decisions + decided and time.perf_counter() >= deadline:
+                break
+            slot = slots[index]
+            neighbours = self.neighbours(index, center_x, center_y)
+            max_speed = self.max_speed[slot]
+            if behaviour[index] == CHASE:
+                vx, vy = self.chase(index, neighbours, center_x, center_y, player_x, player_y)
+            elif behaviour[index] == FLOCK:
+                vx, vy = self.flock(index, neighbours, center_x, center_y, velocity_x, velocity_y, behaviour,
+                                    player_x, player_y, max_speed)
+            else:
+                vx, vy = self.patrol(index, neighbours, velocity_x, height[index], max_speed)
+            length = math.hypot(vx, vy)
+            if length:
+                world.speed[slot] = vx / length * max_speed
+                world.speed_y[slot] = vy / length * max_speed
+            self.next_think[slot] = now + self.intervals[band[index]]
+            decided += 1
+
+        self.deferred += len(order) - decided
+        self.finish(start, decided)
+        return decided
+
+    def finish(self, start, decided):
+        self.decisions += decided
+        self.frame_decisions += decided
+        self.last_ms = (time.perf_counter() - start) * 1000
+        self.frame_ms += self.last_ms
+        self.max_ms = max(self.max_ms, self.frame_ms if self.deadline is not None else self.last_ms)
+
+    def neighbours(self, index, center_x, center_y):
+        """(index, dx, dy, distance) of the other enemies within neighbour_radius"""
+        radius = self.neighbour_radius
+        x, y = center_x[index], center_y[index]
+        found = []
+        for other in self.grid.query_rect(x - radius, y - radius, radius * 2, radius * 2):
+            if other == index:
+                continue
+            dx = center_x[other] - x
+            dy = center_y[other] - y
+            distance = math.hypot(dx, dy)
+            if distance < radius:
+                found.append((other, dx, dy, distance))
+        return found
+
+    def separation(self, neighbours):
+        """Push away from close neighbours, stronger the closer they are"""
+        push_x = push_y = 0.0
+        radius = self.neighbour_radius
+        for _, dx, dy, distance in neighbours:
+            if distance:
+                weight = (1 - distance / radius) / distance
+                push_x -= dx * weight
+                push_y -= dy * weight
+        return push_x, push_y
+
+    def chase(self, index, neighbours, center_x, center_y, player_x, player_y):
+        dx = player_x - center_x[index]
+        dy = player_y - center_y[index]
+        distance = math.hypot(dx, dy) or 1
+        push_x, push_y = self.separation(neighbours)
+        return dx / distance + push_x * 1.5, dy / distance + push_y * 1.5
+
+    def flock(self, index, neighbours, center_x, center_y, velocity_x, velocity_y, behaviour,
+              player_x, player_y, max_speed):
+        dx = player_x - center_x[index]
+        dy = player_y - center_y[index]
+        distance = math.hypot(dx, dy) or 1
+        steer_x = dx / distance * 0.6
+        steer_y = dy / distance * 0.6
+
+        mates = [neighbour for neighbour in neighbours if behaviour[neighbour[0]] == FLOCK]
+        if mates:
+            count = len(mates)
+            # Cohesion: towards the middle of the flockmates
+            steer_x += sum(dx for _, dx, _, _ in mates) / count / self.neighbour_radius
+            steer_y += sum(dy for _, _, dy, _ in mates) / count / self.neighbour_radius
+            # Alignment: match their heading
+            steer_x += sum(velocity_x[other] for other, _, _, _ in mates) / count / max_speed
+            steer_y += sum(velocity_y[other] for other, _, _, _ in mates) / count / max_speed
+        push_x, push_y = self.separation(neighbours)
+        return steer_x + push_x * 1.5, steer_y + push_y * 1.5
+
+    def patrol(self, index, neighbours, velocity_x, height, max_speed):
+        direction = 1 if velocity_x[index] >= 0 else -1
+        # Turn around instead of walking into an enemy ahead on the same row
+        for _, dx, dy, distance in neighbours:
+            if dx * direction > 0 and abs(dy) < height and distance < self.neighbour_radius * 0.6:
+                direction = -direction
+                break
+        return direction * max_speed, 0.0
+
+    def get_stats(self):
+        return {
+            'decisions': self.decisions,
+            'deferred': self.deferred,
+            'last_ms': self.last_ms,
+            'frame_ms': self.frame_ms,
+            'max_ms': self.max_ms
+        }
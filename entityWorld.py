@@ -0,0 +1,198 @@
+import numpy as np
+
+
+class EntityWorld:
+    """Positions, sizes and speeds of moving entities kept in contiguous arrays"""
+
+    def __init__(self, capacity=256):
+        self.capacity = 0
+        self.used = 0           # Slots [0, used) have been handed out at least once
+        self.free_slots = []    # Released slots ready for reuse
+        self.active_count = 0
+
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.width = np.zeros(0, dtype=np.float64)
+        self.height = np.zeros(0, dtype=np.float64)
+        self.speed = np.zeros(0, dtype=np.float64)
+        self.speed_y = np.zeros(0, dtype=np.float64)  # Vertical speed, set by enemy steering
+        self.active = np.zeros(0, dtype=bool)
+        self.moving = np.zeros(0, dtype=bool)  # Moved and bounced off the walls every step
+        self.previous_x = np.zeros(0, dtype=np.float64)  # Positions at the previous tick,
+        self.previous_y = np.zeros(0, dtype=np.float64)  # NaN until an entity has lived a tick
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Resize every array, keeping existing entities"""
+        for name in ('x', 'y', 'width', 'height', 'speed', 'speed_y', 'active', 'moving', 'previous_x', 'previous_y'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def allocate(self, moving=True):
+        """Reserve a slot for a new entity"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.used == self.capacity:
+                self.grow(max(16, self.capacity * 2))
+            slot = self.used
+            self.used += 1
+        self.active[slot] = True
+        self.moving[slot] = moving
+        self.speed[slot] = 0
+        self.speed_y[slot] = 0
+        self.previous_x[slot] = np.nan
+        self.previous_y[slot] = np.nan
+        self.active_count += 1
+        return slot
+
+    def release(self, slot):
+        """Give a slot back once its entity is gone"""
+        self.active[slot] = False
+        self.moving[slot] = False
+        self.free_slots.append(slot)
+        self.active_count -= 1
+
+    def save_previous(self):
+        """Remember the current positions for render interpolation"""
+        n = self.used
+        self.previous_x[:n] = self.x[:n]
+        self.previous_y[:n] = self.y[:n]
+
+    def interpolated_position(self, slot, alpha):
+        """Position between the previous and current tick (0 = previous, 1 = current)"""
+        x = self.x[slot]
+        y = self.y[slot]
+        previous_x = self.previous_x[slot]
+        if previous_x != previous_x:  # NaN: spawned since the last tick
+            return (x, y)
+        previous_y = self.previous_y[slot]
+        return (previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha)
+
+    def overlapping(self, entities, obj):
+        """Indices (in list order) of the entities whose rectangles overlap obj's,
+        in one vectorized AABB test"""
+        if not entities:
+            return []
+        slots = np.fromiter((entity.slot for entity in entities), dtype=np.intp, count=len(entities))
+        x = self.x[slots]
+        y = self.y[slots]
+        hits = ((obj.x < x + self.width[slots]) & (obj.x + obj.width > x) &
+                (obj.y < y + self.height[slots]) & (obj.y + obj.height > y))
+        return np.flatnonzero(hits).tolist()
+
+    def step(self, max_width, scale=1, max_height=None):
+        """Move every moving entity by its speed (times scale) and bounce it off the side walls
+        (and the top and bottom, given max_height)"""
+        n = self.used
+        moving = self.moving[:n]
+        x = self.x[:n]
+        speed = self.speed[:n]
+        width = self.width[:n]
+
+        x += np.where(moving, speed * scale, 0)
+
+        # Same rules as the per-object move(): clamp to the wall and turn around
+        hit_left = moving & (x <= 0)
+        hit_right = moving & ~hit_left & (x >= max_width - width)
+        x[hit_left] = 0
+        speed[hit_left] = np.abs(speed[hit_left])
+        x[hit_right] = max_width - width[hit_right]
+        speed[hit_right] = -np.abs(speed[hit_right])
+
+        if max_height is None:
+            return
+        y = self.y[:n]
+        speed_y = self.speed_y[:n]
+        height = self.height[:n]
+        y += np.where(moving, speed_y * scale, 0)
+        hit_top = moving & (y <= 0)
+        hit_bottom = moving & ~hit_top & (y >= max_height - height)
+        y[hit_top] = 0
+        speed_y[hit_top] = np.abs(speed_y[hit_top])
+        y[hit_bottom] = max_height - height[hit_bottom]
+        speed_y[hit_bottom] = -np.abs(speed_y[hit_bottom])
+
+
+class WorldEntity:
+    """Mixin that stores x, y, width, height and speed in an EntityWorld slot
+
+    Slotted subclasses must list 'world' and 'slot' in their own __slots__ (two
+    bases with non-empty __slots__ can't be combined).
+    """
+
+    __slots__ = ()
+    moves = True  # Whether EntityWorld.step() moves this kind of entity
+
+    def __init__(self, *args, world=None, **kwargs):
+        self.world = world if world is not None else default_world
+        self.slot = self.world.allocate(self.moves)
+        super().__init__(*args, **kwargs)
+
+    def retire(self):
+        """Give the slot back now (an ObjectPool re-initializes the entity later)"""
+        if self.slot is not None:
+            self.world.release(self.slot)
+            self.slot = None
+
+    def __del__(self):
+        # Slots go back to the world as soon as the last reference is dropped
+        try:
+            self.retire()
+        except AttributeError:
+            pass  # __init__ failed before a slot was allocated
+
+    @property
+    def x(self):
+        return self.world.x[self.slot]
+
+    @x.setter
+    def x(self, value):
+        self.world.x[self.slot] = value
+
+    @property
+    def y(self):
+        return self.world.y[self.slot]
+
+    @y.setter
+    def y(self, value):
+        self.world.y[self.slot] = value
+
+    @property
+    def width(self):
+        return self.world.width[self.slot]
+
+    @width.setter
+    def width(self, value):
+        self.world.width[self.slot] = value
+
+    @property
+    def height(self):
+        return self.world.height[self.slot]
+
+    @height.setter
+    def height(self, value):
+        self.world.height[self.slot] = value
+
+    @property
+    def speed(self):
+        return self.world.speed[self.slot]
+
+    @speed.setter
+    def speed(self, value):
+        self.world.speed[self.slot] = value
+
+    @property
+    def speed_y(self):
+        return self.world.speed_y[self.slot]
+
+    @speed_y.setter
+    def speed_y(self, value):
+        self.world.speed_y[self.slot] = value
+
+
+# Used by entities created without an explicit world
+default_world = EntityWorld()
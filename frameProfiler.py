@@ -0,0 +1,162 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+from textCache import text_cache
+
+# Histogram bucket upper bounds in milliseconds (the last bucket catches the rest)
+HISTOGRAM_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, float('inf')]
+HISTOGRAM_LABELS = ['.1', '.25', '.5', '1', '2', '4', '8', '16.7', '33.3', '>']
+
+
+class FrameProfiler:
+    """Per-phase frame timings with a rolling window, an overlay and trace dumps"""
+
+    def __init__(self, window=300, max_trace_events=50000, budget_ms=1000 / 60):
+        self.window = window
+        self.budget_ms = budget_ms  # Frame budget drawn as a line on the graph
+        self.overlay_visible = False
+        self.panel = None  # Overlay surface, created on first draw and reused
+
+        self.phase_times = {}  # Phase name -> deque of per-frame milliseconds
+        self.frame_times = deque(maxlen=window)
+        self.trace_events = deque(maxlen=max_trace_events)  # (name, start_us, duration_us)
+        self.frames = []  # Per-frame phase totals for the CSV dump, bounded like the trace
+        self.max_frames = max_trace_events // 10
+
+        self.origin = time.perf_counter()
+        self.frame_start = None  # None while no frame is being timed
+        self.last_mark = None
+        self.current = {}
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.current = {}
+
+    def mark(self, phase):
+        """Close a phase: everything since the previous mark is charged to it"""
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        elapsed = now - self.last_mark
+        self.current[phase] = self.current.get(phase, 0.0) + elapsed
+        self.trace_events.append((phase, (self.last_mark - self.origin) * 1e6, elapsed * 1e6))
+        self.last_mark = now
+
+    def end_frame(self):
+        """Finish the frame and fold its phase totals into the rolling window"""
+        if self.frame_start is None:
+            return
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_times.append(frame_ms)
+        row = {'frame': frame_ms}
+        for phase, seconds in self.current.items():
+            times = self.phase_times.get(phase)
+            if times is None:
+                times = self.phase_times[phase] = deque(maxlen=self.window)
+            times.append(seconds * 1000)
+            row[phase] = seconds * 1000
+        self.frames.append(row)
+        if len(self.frames) > self.max_frames:
+            del self.frames[:len(self.frames) - self.max_frames]
+        self.frame_start = None
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+
+    def get_histogram(self, phase):
+        """Counts of recent frames per HISTOGRAM_BUCKETS bucket for a phase (or 'frame')"""
+        times = self.frame_times if phase == 'frame' else self.phase_times.get(phase, ())
+        counts = [0] * len(HISTOGRAM_BUCKETS)
+        for ms in times:
+            for index, bound in enumerate(HISTOGRAM_BUCKETS):
+                if ms <= bound:
+                    counts[index] += 1
+                    break
+        return counts
+
+    def get_stats(self):
+        """Average and worst milliseconds per phase over the rolling window"""
+        stats = {}
+        for phase, times in self.phase_times.items():
+            if times:
+                stats[phase] = {'avg_ms': sum(times) / len(times), 'max_ms': max(times)}
+        return stats
+
+    def draw_overlay(self, surface, position=(490, 60)):
+        """Draw the phase table, frame-time graph and histogram; returns the covered rect"""
+        width, height = 300, 335
+        panel = self.panel
+        if panel is None:
+            panel = self.panel = pygame.Surface((width, height))
+            panel.set_alpha(200)
+        panel.fill((0, 0, 0))
+
+        # Phase table, slowest first
+        y = 5
+        stats = sorted(self.get_stats().items(), key=lambda item: -item[1]['avg_ms'])
+        for label, x in (("phase", 5), ("avg ms", 170), ("max ms", 235)):
+            panel.blit(text_cache.render(label, 18, (255, 255, 0)), (x, y))
+        for phase, timing in stats[:8]:
+            y += 14
+            panel.blit(text_cache.render(phase, 18, (255, 255, 255)), (5, y))
+            panel.blit(text_cache.render(f"{timing['avg_ms']:.2f}", 18, (255, 255, 255)), (170, y))
+            panel.blit(text_cache.render(f"{timing['max_ms']:.2f}", 18, (255, 255, 255)), (235, y))
+
+        # Frame-time graph: one column per frame, red when over budget
+        graph_top, graph_height = 152, 93
+        scale = graph_height / (self.budget_ms * 2)
+        budget_y = graph_top + graph_height - int(self.budget_ms * scale)
+        pygame.draw.line(panel, (255, 255, 0), (0, budget_y), (width, budget_y))
+        frames = list(self.frame_times)[-width:]
+        for x, ms in enumerate(frames):
+            bar = min(graph_height, int(ms * scale))
+            color = (255, 60, 60) if ms > self.budget_ms else (60, 255, 60)
+            pygame.draw.line(panel, color, (x, graph_top + graph_height), (x, graph_top + graph_height - bar))
+        if frames:
+            label = f"frame {frames[-1]:5.2f} ms"
+            panel.blit(text_cache.render(label, 18, (255, 255, 0)), (5, graph_top - 16))
+
+        # Frame-time histogram over the rolling window, one column per bucket
+        histogram_top, histogram_height = 268, 50
+        column = width // len(HISTOGRAM_BUCKETS)
+        panel.blit(text_cache.render("frame ms histogram", 18, (255, 255, 0)), (5, histogram_top - 16))
+        counts = self.get_histogram('frame')
+        most = max(counts) or 1
+        for index, (count, label) in enumerate(zip(counts, HISTOGRAM_LABELS)):
+            x = index * column
+            bar = int(count * histogram_height / most)
+            # Red for buckets whose frames are all over budget
+            lower = HISTOGRAM_BUCKETS[index - 1] if index else 0
+            color = (255, 60, 60) if lower >= self.budget_ms else (60, 255, 60)
+            if bar:
+                pygame.draw.rect(panel, color, (x + 2, histogram_top + histogram_height - bar, column - 4, bar))
+            panel.blit(text_cache.render(label, 14, (255, 255, 255)), (x + 2, histogram_top + histogram_height + 2))
+
+        return surface.blit(panel, position)
+
+    def dump_csv(self, path):
+        """Write one row per recorded frame with the milliseconds of every phase"""
+        phases = sorted({phase for row in self.frames for phase in row if phase != 'frame'})
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + phases)
+            for row in self.frames:
+                writer.writerow([f"{row['frame']:.4f}"] + [f"{row.get(phase, 0.0):.4f}" for phase in phases])
+
+    def dump_chrome_trace(self, path):
+        """Write the recorded phases in Chrome trace format (chrome://tracing, Perfetto)"""
+        events = [{'name': name, 'ph': 'X', 'ts': start, 'dur': duration, 'pid': 0, 'tid': 0}
+                  for name, start, duration in self.trace_events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def dump(self, path):
+        """Write a CSV or Chrome trace depending on the file extension"""
+        if path.lower().endswith('.csv'):
+            self.dump_csv(path)
+        else:
+            self.dump_chrome_trace(path)
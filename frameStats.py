@@ -0,0 +1,31 @@
+import math
+from collections import deque
+
+
+class FrameStats:
+    """Rolling window of frame times for frame-rate and jitter reporting"""
+
+    def __init__(self, window=600):
+        self.frame_times = deque(maxlen=window)  # Seconds per frame, newest last
+
+    def record(self, frame_time):
+        """Add the duration of one frame"""
+        self.frame_times.append(frame_time)
+
+    def get_stats(self):
+        """Get frame-time statistics in milliseconds"""
+        if not self.frame_times:
+            return None
+        times = sorted(self.frame_times)
+        count = len(times)
+        mean = sum(times) / count
+        variance = sum((t - mean) ** 2 for t in times) / count
+        return {
+            'frames': count,
+            'fps': 1 / mean if mean else 0.0,
+            'mean_ms': mean * 1000,
+            'min_ms': times[0] * 1000,
+            'max_ms': times[-1] * 1000,
+            'p99_ms': times[min(count - 1, int(count * 0.99))] * 1000,
+            'jitter_ms': math.sqrt(variance) * 1000  # Standard deviation of the frame time
+        }
@@ -2,61 +2,87 @@ import pygame
 import random
 import math
 import os
+import time
 from gameObject import GameObject
+from imageCache import image_cache
+from textCache import text_cache
+from dirtyRenderer import DirtyRectRenderer
+from particles import ParticlePool
+from entityWorld import EntityWorld, WorldEntity
+from frameStats import FrameStats
+from frameProfiler import FrameProfiler
+from hudLayer import HudLayer, BackdropLayer
+from voiceManager import voice_manager
+from audioService import audio
+from startupTimer import startup_timer
+from objectPool import ObjectPool, GcPolicy
+from inputReplay import InputRecorder, keys_to_mask, QUIT_BIT
+from timingWheel import TimingWheel
+from enemyAI import EnemyAI, PATROL, CHASE, FLOCK
+import gameState
 from player import Player
 from enemy import Enemy
 
 
 class SoundEffect:
     def __init__(self): 
-        pygame.mixer.music.load('assets/background_music.mp3')
-        pygame.mixer.music.set_volume(1.0)
-        pygame.mixer.music.play(-1)
-        self.popSound = pygame.mixer.Sound('assets/pop.wav')
-        self.correctSound = pygame.mixer.Sound('assets/correct.wav')
-        self.wrongSound = pygame.mixer.Sound('assets/wrong.wav')
-        self.clickSound = pygame.mixer.Sound('assets/click.wav')
-        self.levelUpSound = pygame.mixer.Sound('assets/levelup.wav')
-        self.gameOverSound = pygame.mixer.Sound('assets/gameover.wav')
-        self.backgroundMusic = pygame.mixer.Sound('assets/background_music.mp3')
-        self.backgroundMusic.set_volume(0.5)
-        self.backgroundMusic.play(-1)
+        # The track is streamed; only the short effects are decoded
+        self.backgroundMusic = 'assets/background_music.mp3'
+        audio.play_music(self.backgroundMusic, volume=1.0)
+        self.popSound = audio.load_sound('assets/pop.wav')
+        self.correctSound = audio.load_sound('assets/correct.wav')
+        self.wrongSound = audio.load_sound('assets/wrong.wav')
+        self.clickSound = audio.load_sound('assets/click.wav')
+        self.levelUpSound = audio.load_sound('assets/levelup.wav')
+        self.gameOverSound = audio.load_sound('assets/gameover.wav')
+
+        # Feedback sounds are frequent and may be dropped; UI cues never share the pool
+        voice_manager.configure('pop', priority=1, max_instances=3, max_per_frame=2)
+        voice_manager.configure('correct', priority=2, max_instances=2, max_per_frame=1)
+        voice_manager.configure('wrong', priority=2, max_instances=2, max_per_frame=1)
+        for sound_name in ['click', 'levelup', 'gameover']:
+            voice_manager.configure(sound_name, priority=3, max_instances=1, ui=True)
 
     def play_sound(self, sound_name):
         if sound_name == 'pop':
-            self.popSound.play()
+            voice_manager.play('pop', self.popSound)
         elif sound_name == 'correct':
-            self.correctSound.play()
+            voice_manager.play('correct', self.correctSound)
         elif sound_name == 'wrong':
-            self.wrongSound.play()
+            voice_manager.play('wrong', self.wrongSound)
         elif sound_name == 'click':
-            self.clickSound.play()
+            voice_manager.play('click', self.clickSound)
         elif sound_name == 'levelup':
-            self.levelUpSound.play()
+            voice_manager.play('levelup', self.levelUpSound)
         elif sound_name == 'gameover':
-            self.gameOverSound.play()
+            voice_manager.play('gameover', self.gameOverSound)
         elif sound_name == 'background':
-            self.backgroundMusic.play()
+            audio.play_music(self.backgroundMusic, loops=0)
 
     def stop_sound(self, sound_name):
         if sound_name == 'background':
-            self.backgroundMusic.stop()
+            audio.stop_music()
+
+class PowerUp(WorldEntity, GameObject):
+    __slots__ = ('world', 'slot', 'power_type', 'color', 'active')
+    moves = False  # Power-ups stay where they spawn
 
-class PowerUp(GameObject):
-    def __init__(self, x, y, width, height, image_path, power_type, color):
-        super().__init__(x, y, width, height, image_path)
+    def __init__(self, x, y, width, height, image_path, power_type, color, world=None):
+        super().__init__(x, y, width, height, image_path, world=world)
         self.power_type = power_type   # "speed", "shield", "points"
         self.color = color
         self.active = True
 
-class TreasureItem(GameObject):
-    def __init__(self, x, y, width, height, image_path, item_type):
-        super().__init__(x, y, width, height, image_path)
+class TreasureItem(WorldEntity, GameObject):
+    __slots__ = ('world', 'slot', 'item_type', 'collected', 'returned', 'color')
+
+    def __init__(self, x, y, width, height, image_path, item_type, world=None, rng=random):
+        super().__init__(x, y, width, height, image_path, world=world)
         self.item_type = item_type  # "gem", "coin", "crown"
         self.collected = False
         self.returned = False
         self.color = None  # Color to display (None = default)
-        self.speed = random.choice([-4, -3, -2, 2, 3, 4])  # Move horizontally like enemy
+        self.speed = rng.choice([-4, -3, -2, 2, 3, 4])  # Move horizontally like enemy
 
     def move(self, max_width):
         self.x += self.speed
@@ -67,28 +93,17 @@ class TreasureItem(GameObject):
             self.x = max_width - self.width
             self.speed = -abs(self.speed)
 
-class MagicParticle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(2, 6)
-        self.life = random.randint(20, 40)
-        self.max_life = self.life
-        self.dx = random.uniform(-2, 2)
-        self.dy = random.uniform(-2, 2)
+class WorldEnemy(WorldEntity, Enemy):
+    """Enemy whose position and speed live in an EntityWorld"""
 
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
+class KeyState:
+    """Stand-in for pygame.key.get_pressed() built from the keys held this tick"""
 
-    def draw(self, surface):
-        if self.life > 0:
-            alpha = int((self.life / self.max_life) * 255)
-            color_with_alpha = (*self.color, alpha)
-            pygame.draw.circle(surface, color_with_alpha, (int(self.x), int(self.y)), int(self.size))
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color):
@@ -97,13 +112,13 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.current_color = color
-        self.font = pygame.font.Font(None, 36)
+        self.font_size = 36
 
     def draw(self, surface):
         pygame.draw.rect(surface, self.current_color, self.rect)
         pygame.draw.rect(surface, (255, 255, 255), self.rect, 2)
         
-        text_surface = self.font.render(self.text, True, (255, 255, 255))
+        text_surface = text_cache.render(self.text, self.font_size, (255, 255, 255))
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
 
@@ -119,33 +134,94 @@ class Button:
         return False
 
 class Game:
+    # Timed gameplay events, in the order they fire when due on the same tick
+    EVENTS = ['enemy_spawn', 'treasure_spawn', 'power_up_end', 'power_up_spawn', 'level_timeout']
     
-    def __init__(self):
+    def __init__(self, dirty_rendering=False, headless=False, seed=None, rng=None,
+                 tick_rate=60, max_fps=60, busy_loop=False, profile_output=None, gc_mode=None,
+                 record_path=None, rewind_seconds=0, rewind_max_bytes=4 * 1024 * 1024,
+                 ai_budget_ms=1.0, ai_max_decisions=None):
         self.width = 800
         self.height = 800
 
+        # Fixed simulation rate; rendering runs at its own rate up to max_fps (None = uncapped)
+        self.tick_rate = tick_rate
+        self.max_fps = max_fps
+        self.busy_loop = busy_loop  # Pace frames with tick_busy_loop for less jitter
+        # Speeds are tuned per 1/60 s, so movement is scaled at other tick rates
+        self.motion_scale = 1 if tick_rate == 60 else 60 / tick_rate
+        self.render_alpha = 1.0  # How far rendering is between the last two ticks
+        self.player_previous = None
+        self.frame_stats = FrameStats()
+        
+        # Per-phase timings (F3 shows them), dumped as CSV or Chrome trace JSON on exit
+        self.profiler = FrameProfiler(budget_ms=1000 / (max_fps or 60))
+        self.profile_output = profile_output
+
+        # Headless games run on the SDL dummy driver with no window, drawing or frame cap
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            if pygame.display.get_init() and pygame.display.get_driver() != 'dummy':
+                pygame.display.quit()
+            pygame.display.init()
+
+        # All gameplay randomness comes from here so a seed reproduces a session
+        if record_path:
+            # The replay rebuilds the rng from the seed alone, which the file stores as 64 bits
+            if rng is not None:
+                raise ValueError("Recording needs a seed rather than an rng")
+            if seed is None:
+                seed = random.getrandbits(63)  # A recording needs a known seed
+            elif not isinstance(seed, int) or not 0 <= seed < 2 ** 64:
+                raise ValueError("Recording needs an integer seed in [0, 2**64)")
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.tick_count = 0
+        
+        # Optional input recording (see inputReplay.py), saved when the game loop ends
+        self.record_path = record_path
+        self.recorder = InputRecorder(seed, tick_rate) if record_path else None
+
         self.game_window = pygame.display.set_mode((self.width, self.height))
         self.clock = pygame.time.Clock()
         
+        # Only the first windowed game times its startup; headless and later games leave the report alone
+        if not headless and startup_timer.owner is None:
+            startup_timer.owner = self
+        
+        # Put something on screen before loading anything else
+        if not headless:
+            self.game_window.fill((0, 0, 0))
+            loading_text = text_cache.render("Loading...", 36, (255, 255, 255))
+            self.game_window.blit(loading_text, loading_text.get_rect(center=(self.width // 2, self.height // 2)))
+            pygame.display.flip()
+        self.mark_startup('display')
+        
+        # Work left for after the first frames, run one task per frame (see defer)
+        self.deferred = []
+        
+        # Gameplay timers (power-ups, spawns, the level timeout) are events on one timing wheel
+        self.timers = TimingWheel()
+        self.events = {}  # Event name -> its Timer
+        
         # Game state
         self.score = 0
         self.lives = 3
         self.game_over = False
         self.power_up_active = False
-        self.power_up_timer = 0
         
         # Level system
         self.current_level = 1
         self.level_completed = False
-        self.level_start_time = 0
+        self.level_start_time = 0  # Tick the current level started on
         
         # Time limit system (varies by level)
-        self.base_time_limit = 7200  # 2 minutes base
+        self.base_time_limit = self.ticks(120)  # 2 minutes base
         self.time_limit = self.base_time_limit
-        self.time_remaining = self.time_limit
         
         # Magic effects
-        self.magic_particles = []
+        self.magic_particles = ParticlePool(seed=self.rng.getrandbits(32))
+        self.particles_per_frame = 6  # Emitted in one batch per tick
         
         # Power-ups
         self.power_ups = []
@@ -155,37 +231,130 @@ class Game:
         self.treasure_items = []
         self.items_collected = 0
         self.total_items = 5
-        self.treasure_box = GameObject(375, 50, 50, 50, 'assets/chest.png')
         
         # Enemy system (varies by level)
-        self.enemy_spawn_timer = 0
-        self.enemy_spawn_delay = 180  # 3 seconds at 60 FPS
+        self.enemy_spawn_delay = self.ticks(3)
         self.max_enemies = 8  # Base max enemies
         self.enemy_speed_multiplier = 1.0  # Speed multiplier for enemies
         
         # Treasure item spawning system
-        self.treasure_spawn_timer = 0
-        self.treasure_spawn_delay = 600  # 10 seconds at 60 FPS
+        self.treasure_spawn_delay = self.ticks(10)
         self.max_treasure_items = 15  # Maximum treasure items on screen at once
 
-        # Fixed image file paths to match actual files
-        self.background = GameObject(0, 0, self.width, self.height, 'assets/background.png')
-        self.player = Player(375, 700, 50, 50, 'assets/character.png', 10)
+        # How power-ups and collected items are colored: 'fill' (flat square) or 'tint' (sprite)
+        self.tint_mode = 'fill'
+        
+        # Optional renderer that only repaints the areas sprites moved through (made with the sprites)
+        self.dirty_rendering = dirty_rendering
+        self.dirty_renderer = None
+        
+        # Enemies, items and power-ups keep their positions in shared arrays
+        self.world = EntityWorld()
+        
+        # Removed entities are recycled instead of reallocated
+        self.enemy_pool = ObjectPool(WorldEnemy)
+        self.item_pool = ObjectPool(TreasureItem)
+        self.power_up_pool = ObjectPool(PowerUp)
+        
+        # Optional GC freezing/tuning while the game loop runs ('freeze', 'tune' or None)
+        self.gc_policy = GcPolicy(gc_mode)
+        
+        # Optional rewind history: one delta-compressed snapshot per tick
+        self.rewind_buffer = None
+        if rewind_seconds:
+            self.rewind_buffer = gameState.SnapshotRing(max_snapshots=self.ticks(rewind_seconds) + 1,
+                                                        max_bytes=rewind_max_bytes)
+        
+        # Enemy steering, spread over frames within ai_budget_ms per frame. Headless and recorded games
+        # cap the decisions per tick instead of timing them, so they play out the same anywhere
+        if ai_max_decisions is None and (headless or record_path):
+            ai_max_decisions = 12
+        self.enemy_ai = EnemyAI(self.world, budget_ms=ai_budget_ms, max_decisions=ai_max_decisions,
+                                lod=((150, self.ticks(1 / 60)), (350, self.ticks(0.05)), (None, self.ticks(0.15))))
         
-        # Initialize enemies
         self.enemies = []
-        self.setup_level()
+        
+        # Retained HUD layers, re-rendered only where values change
+        self.hud = HudLayer()
+        self.level_complete_layer = BackdropLayer((self.width, self.height))
+        self.game_over_layer = BackdropLayer((self.width, self.height), alpha=200)
         
         # UI Buttons
         self.quit_button = Button(self.width - 120, 10, 100, 40, "QUIT", (200, 50, 50), (255, 100, 100))
+        self.mark_startup('ui')
+        
+        # A window keeps showing "Loading..." while the sprites and the first level are set up,
+        # one stage per frame (see run_frames); headless games need them before the first tick
+        self.ready = False
+        if headless:
+            self.load_assets()
+            self.start_first_level()
+        else:
+            self.defer(self.load_assets, 'assets')
+            self.defer(self.start_first_level, 'level setup')
+
+    def load_assets(self):
+        """Decode the sprites"""
+        # Fixed image file paths to match actual files
+        self.background = GameObject(0, 0, self.width, self.height, 'assets/background.png')
+        self.treasure_box = GameObject(375, 50, 50, 50, 'assets/chest.png')
+        self.player = Player(375, 700, 50, 50, 'assets/character.png', 10)
+        if self.dirty_rendering:
+            self.dirty_renderer = DirtyRectRenderer(self.game_window, self.background.image)
+
+    def start_first_level(self):
+        """Set up the first level; the game starts ticking after this"""
+        self.setup_level()
+        self.ready = True
+
+    def defer(self, task, name):
+        """Run task() after the first frame is up; tasks run one per frame, in order"""
+        self.deferred.append((task, name))
+
+    def run_deferred(self):
+        """Run the next deferred task; prints the startup report once none are left"""
+        if self.deferred:
+            task, name = self.deferred.pop(0)
+            task()
+            self.mark_startup(name)
+        elif startup_timer.owner is self and not startup_timer.finished:
+            startup_timer.finish()
+
+    def mark_startup(self, stage):
+        """Close a startup stage, if this is the game whose startup is being timed"""
+        if startup_timer.owner is self:
+            startup_timer.mark(stage)
+
+    def schedule_event(self, name, delay):
+        """(Re)schedule a gameplay event; it runs the on_<name> method in delay ticks"""
+        self.timers.cancel(self.events.get(name))
+        self.events[name] = self.timers.schedule(delay, getattr(self, 'on_' + name),
+                                                 priority=self.EVENTS.index(name))
+
+    def cancel_event(self, name):
+        self.timers.cancel(self.events.pop(name, None))
+
+    def event_remaining(self, name):
+        """Ticks until an event fires, 0 if it isn't scheduled"""
+        return self.timers.remaining(self.events.get(name))
+
+    @property
+    def time_remaining(self):
+        return self.event_remaining('level_timeout')
+
+    def on_level_timeout(self):
+        self.game_over = True
 
     def setup_level(self):
         """Setup the current level with appropriate difficulty"""
         # Clear existing enemies and items
+        self.enemy_pool.release_all(self.enemies)
+        self.item_pool.release_all(self.treasure_items)
         self.enemies = []
         self.treasure_items = []
         self.treasure_opened = False
         self.items_collected = 0
+        self.cancel_event('treasure_spawn')
         
         # Level-specific settings
         if self.current_level == 1:
@@ -216,52 +385,55 @@ class Game:
         else:  # Level 6+
             self.max_enemies = 15 + (self.current_level - 5) * 2
             self.enemy_speed_multiplier = 1.8 + (self.current_level - 5) * 0.2
-            self.time_limit = max(1800, int(self.base_time_limit * (0.5 - (self.current_level - 5) * 0.05)))  # Minimum 30 seconds
+            self.time_limit = max(self.ticks(30), int(self.base_time_limit * (0.5 - (self.current_level - 5) * 0.05)))  # Minimum 30 seconds
             self.total_items = min(25, 20 + (self.current_level - 5) * 2)  # Increased max items
         
         # Reset time
-        self.time_remaining = self.time_limit
-        self.level_start_time = pygame.time.get_ticks()
+        self.schedule_event('level_timeout', self.time_limit)
+        self.level_start_time = self.tick_count
         
         # Spawn initial enemies for this level
         self.spawn_enemies()
+        self.cancel_event('enemy_spawn')
+        self.update_enemy_spawning()
         
         # Clear power-ups and spawn new ones
+        self.power_up_pool.release_all(self.power_ups)
         self.power_ups = []
         self.spawn_power_up()
+        self.update_power_up_spawning()
+        
+        # A level change is a natural pause for a full collection
+        self.gc_policy.checkpoint()
 
     def spawn_magic_particles(self):
         """Spawn magic particles around the player"""
         if self.power_up_active:
-            # Spawn particles around player
-            for _ in range(3):  # Spawn 3 particles per frame
-                x = self.player.x + random.randint(0, self.player.width)
-                y = self.player.y + random.randint(0, self.player.height)
-                
-                # Use the current power-up color
-                if hasattr(self, 'current_power_color'):
-                    color = self.current_power_color
-                else:
-                    color = (255, 255, 255)  # White default
-                
-                particle = MagicParticle(x, y, color)
-                self.magic_particles.append(particle)
+            # Use the current power-up color
+            if getattr(self, 'current_power_color', None):
+                color = self.current_power_color
+            else:
+                color = (255, 255, 255)  # White default
+            
+            # Spawn the whole frame's particles around the player in one batch
+            self.magic_particles.emit(self.particles_per_frame, self.player.x, self.player.y,
+                                      self.player.width, self.player.height, color)
 
     def update_magic_particles(self):
         """Update magic particles"""
-        # Update existing particles
-        for particle in self.magic_particles[:]:
-            particle.update()
-            if particle.life <= 0:
-                self.magic_particles.remove(particle)
+        # Update existing particles (dead ones are compacted away)
+        self.magic_particles.update()
         
         # Spawn new particles if power-up is active
         self.spawn_magic_particles()
 
     def draw_magic_particles(self):
         """Draw magic particles"""
-        for particle in self.magic_particles:
-            particle.draw(self.game_window)
+        particle_area = self.magic_particles.draw(self.game_window)
+        
+        # The whole particle cloud is tracked as a single dirty area
+        if particle_area and self.dirty_renderer:
+            self.dirty_renderer.add(particle_area)
 
     def spawn_enemies(self):
         """Spawn initial enemies based on current level"""
@@ -277,47 +449,64 @@ class Game:
         for i in range(min(self.max_enemies, len(base_positions))):
             x, y = base_positions[i]
             # Vary speed based on level
-            base_speed = random.choice([-3, -2, 2, 3, 4])
+            base_speed = self.rng.choice([-3, -2, 2, 3, 4])
             speed = int(base_speed * self.enemy_speed_multiplier)
-            enemy = Enemy(x, y, 50, 50, 'assets/enemy.png', speed)
+            enemy = self.enemy_pool.acquire(x, y, 50, 50, 'assets/enemy.png', speed, world=self.world)
+            self.enemy_ai.add(enemy.slot, self.pick_behaviour(), self.tick_count)
             self.enemies.append(enemy)
 
+    def pick_behaviour(self):
+        """Behaviour for a new enemy: level 1 only patrols, then chasers and flocks join in"""
+        if self.current_level == 1:
+            return PATROL
+        roll = self.rng.random()
+        chase_share = min(0.4, (self.current_level - 1) * 0.1)
+        flock_share = min(0.3, (self.current_level - 1) * 0.075)
+        if roll < chase_share:
+            return CHASE
+        if roll < chase_share + flock_share:
+            return FLOCK
+        return PATROL
+
     def spawn_new_enemy(self):
         """Spawn a single new enemy at random position"""
         # Random position on the edges
-        side = random.choice(['top', 'bottom', 'left', 'right'])
+        side = self.rng.choice(['top', 'bottom', 'left', 'right'])
         
         if side == 'top':
-            x = random.randint(50, self.width - 100)
-            y = random.randint(50, 150)
+            x = self.rng.randint(50, self.width - 100)
+            y = self.rng.randint(50, 150)
         elif side == 'bottom':
-            x = random.randint(50, self.width - 100)
-            y = random.randint(650, 750)
+            x = self.rng.randint(50, self.width - 100)
+            y = self.rng.randint(650, 750)
         elif side == 'left':
-            x = random.randint(50, 150)
-            y = random.randint(100, self.height - 100)
+            x = self.rng.randint(50, 150)
+            y = self.rng.randint(100, self.height - 100)
         else:  # right
-            x = random.randint(650, 750)
-            y = random.randint(100, self.height - 100)
+            x = self.rng.randint(650, 750)
+            y = self.rng.randint(100, self.height - 100)
         
         # Random speed with level multiplier
-        base_speed = random.choice([-4, -3, -2, 2, 3, 4])
+        base_speed = self.rng.choice([-4, -3, -2, 2, 3, 4])
         speed = int(base_speed * self.enemy_speed_multiplier)
         
-        enemy = Enemy(x, y, 50, 50, 'assets/enemy.png', speed)
+        enemy = self.enemy_pool.acquire(x, y, 50, 50, 'assets/enemy.png', speed, world=self.world)
+        self.enemy_ai.add(enemy.slot, self.pick_behaviour(), self.tick_count)
         self.enemies.append(enemy)
 
     def update_enemy_spawning(self):
-        """Update enemy spawning system"""
-        if len(self.enemies) < self.max_enemies:
-            self.enemy_spawn_timer += 1
+        """Keep the next enemy spawn scheduled while there is room for more enemies"""
+        if len(self.enemies) < self.max_enemies and not self.event_remaining('enemy_spawn'):
             # Faster spawning in higher levels
-            spawn_delay = max(60, self.enemy_spawn_delay - (self.current_level - 1) * 20)
-            if self.enemy_spawn_timer >= spawn_delay:
-                self.spawn_new_enemy()
-                self.enemy_spawn_timer = 0
-                # Decrease spawn delay to make it more challenging
-                self.enemy_spawn_delay = max(30, self.enemy_spawn_delay - 10)
+            spawn_delay = max(self.ticks(1), self.enemy_spawn_delay - (self.current_level - 1) * self.ticks(1 / 3))
+            self.schedule_event('enemy_spawn', spawn_delay)
+
+    def on_enemy_spawn(self):
+        if len(self.enemies) < self.max_enemies:
+            self.spawn_new_enemy()
+            # Decrease spawn delay to make it more challenging
+            self.enemy_spawn_delay = max(self.ticks(0.5), self.enemy_spawn_delay - self.ticks(1 / 6))
+        self.update_enemy_spawning()
 
     def open_treasure(self):
         """Open the treasure and scatter items"""
@@ -325,6 +514,7 @@ class Game:
             self.treasure_opened = True
             self.scatter_treasure_items()
             self.score += 100 * self.current_level  # Bonus scales with level
+            self.update_treasure_spawning()
 
     def scatter_treasure_items(self):
         """Scatter treasure items around the map"""
@@ -336,32 +526,32 @@ class Game:
             
             if zone == 0:
                 # Top-left area
-                x = random.randint(50, 250)
-                y = random.randint(50, 200)
+                x = self.rng.randint(50, 250)
+                y = self.rng.randint(50, 200)
             elif zone == 1:
                 # Top-right area
-                x = random.randint(550, 750)
-                y = random.randint(50, 200)
+                x = self.rng.randint(550, 750)
+                y = self.rng.randint(50, 200)
             elif zone == 2:
                 # Middle-left area
-                x = random.randint(50, 250)
-                y = random.randint(250, 400)
+                x = self.rng.randint(50, 250)
+                y = self.rng.randint(250, 400)
             elif zone == 3:
                 # Middle-right area
-                x = random.randint(550, 750)
-                y = random.randint(250, 400)
+                x = self.rng.randint(550, 750)
+                y = self.rng.randint(250, 400)
             elif zone == 4:
                 # Bottom-left area
-                x = random.randint(50, 250)
-                y = random.randint(450, 600)
+                x = self.rng.randint(50, 250)
+                y = self.rng.randint(450, 600)
             else:  # zone == 5
                 # Bottom-right area
-                x = random.randint(550, 750)
-                y = random.randint(450, 600)
+                x = self.rng.randint(550, 750)
+                y = self.rng.randint(450, 600)
             
             # Add some random variation to avoid perfect grid
-            x += random.randint(-20, 20)
-            y += random.randint(-20, 20)
+            x += self.rng.randint(-20, 20)
+            y += self.rng.randint(-20, 20)
             
             # Ensure items stay within screen bounds
             x = max(50, min(x, self.width - 80))
@@ -369,15 +559,15 @@ class Game:
             
             item_type = item_types[i % len(item_types)]
             # Use different colored versions of enemy image for items (you can replace with actual item images)
-            item = TreasureItem(x, y, 30, 30, 'assets/enemy.png', item_type)
+            item = self.item_pool.acquire(x, y, 30, 30, 'assets/enemy.png', item_type, world=self.world, rng=self.rng)
             self.treasure_items.append(item)
 
     def spawn_power_up(self):
         """Spawn a new power-up at random location"""
         if len(self.power_ups) < 2:  # Max 2 power-ups at once
-            x = random.randint(50, self.width - 100)
-            y = random.randint(100, self.height - 100)
-            power_type = random.choice(["speed", "shield", "points"])
+            x = self.rng.randint(50, self.width - 100)
+            y = self.rng.randint(100, self.height - 100)
+            power_type = self.rng.choice(["speed", "shield", "points"])
             
             # Define the allowed colors for power-ups (including sky blue)
             allowed_colors = [
@@ -393,10 +583,10 @@ class Game:
                 (135, 206, 235) # Sky Blue
             ]
             
-            color = random.choice(allowed_colors)
+            color = self.rng.choice(allowed_colors)
             
             # Use enemy image for power-ups (you can replace with actual power-up images)
-            power_up = PowerUp(x, y, 30, 30, 'assets/enemy.png', power_type, color)
+            power_up = self.power_up_pool.acquire(x, y, 30, 30, 'assets/enemy.png', power_type, color, world=self.world)
             self.power_ups.append(power_up)
 
     def check_collision(self, obj1, obj2):
@@ -408,21 +598,31 @@ class Game:
 
     def check_enemy_collision(self):
         """Check collision between player and enemies"""
-        for enemy in self.enemies[:]:  # Use slice to avoid modification during iteration
-            if self.check_collision(self.player, enemy):
+        last_checked = -1  # Enemies are checked in list order, each one once
+        player_moved = True
+        while player_moved:
+            player_moved = False
+            for index in self.world.overlapping(self.enemies, self.player):
+                if index <= last_checked:
+                    continue
+                last_checked = index
                 if not self.power_up_active:
                     self.lives -= 1
                     if self.lives <= 0:
                         self.game_over = True
                     else:
-                        # Reset player position
+                        # Reset player position and check the rest of the enemies there
                         self.player.x = 375
                         self.player.y = 700
+                        self.player_previous = None  # Don't interpolate the jump
+                        player_moved = True
+                        break
                 else:
                     # Destroy enemy if shield is active
-                    self.enemies.remove(enemy)
+                    self.enemy_pool.release(self.enemies.pop(index))
                     self.score += 50 * self.current_level  # Score scales with level
-                    break
+                    self.update_enemy_spawning()
+                    return
 
     def check_treasure_collision(self):
         """Check if player reached the treasure"""
@@ -443,8 +643,10 @@ class Game:
 
     def check_treasure_item_collision(self):
         """Check collision between player and treasure items"""
-        for item in self.treasure_items[:]:
-            if not item.collected and self.check_collision(self.player, item):
+        collected_before = self.items_collected
+        for index in self.world.overlapping(self.treasure_items, self.player):
+            item = self.treasure_items[index]
+            if not item.collected:
                 item.collected = True
                 self.items_collected += 1
                 self.score += 50 * self.current_level
@@ -453,207 +655,233 @@ class Game:
                     item.color = self.current_power_color
                 else:
                     item.color = (255, 255, 255)  # Default to white
-                self.treasure_items.remove(item)
                 # Optionally: keep item on screen for a moment to show color (not removed immediately)
+        
+        # Remove collected items after the scan instead of while iterating
+        if self.items_collected != collected_before:
+            self.item_pool.release_all([item for item in self.treasure_items if item.collected])
+            self.treasure_items = [item for item in self.treasure_items if not item.collected]
+            self.update_treasure_spawning()
 
     def check_power_up_collision(self):
         """Check collision between player and power-ups"""
-        for power_up in self.power_ups[:]:
-            if self.check_collision(self.player, power_up):
-                self.current_power_type = power_up.power_type
-                self.current_power_color = power_up.color
-                if power_up.power_type == "speed":
-                    self.player.speed += 5
-                    self.power_up_active = True
-                    self.power_up_timer = 300  # 5 seconds at 60 FPS
-                elif power_up.power_type == "shield":
-                    self.power_up_active = True
-                    self.power_up_timer = 600  # 10 seconds at 60 FPS
-                elif power_up.power_type == "points":
-                    self.score += 200 * self.current_level  # Points scale with level
-                
-                self.power_ups.remove(power_up)
+        picked_up = []
+        for index in self.world.overlapping(self.power_ups, self.player):
+            power_up = self.power_ups[index]
+            self.current_power_type = power_up.power_type
+            self.current_power_color = power_up.color
+            if power_up.power_type == "speed":
+                self.player.speed += 5
+                self.power_up_active = True
+                self.schedule_event('power_up_end', self.ticks(5))
+            elif power_up.power_type == "shield":
+                self.power_up_active = True
+                self.schedule_event('power_up_end', self.ticks(10))
+            elif power_up.power_type == "points":
+                self.score += 200 * self.current_level  # Points scale with level
+            
+            picked_up.append(power_up)
+        
+        # Remove picked-up power-ups after the scan instead of while iterating
+        if picked_up:
+            self.power_up_pool.release_all(picked_up)
+            self.power_ups = [power_up for power_up in self.power_ups if power_up not in picked_up]
 
-    def update_power_ups(self):
-        """Update power-up timers and spawn new ones"""
-        if self.power_up_active:
-            self.power_up_timer -= 1
-            if self.power_up_timer <= 0:
-                self.power_up_active = False
-                self.current_power_type = None
-                self.current_power_color = None
-                if self.player.speed > 10:  # Reset speed boost
-                    self.player.speed = 10
-        
-        # Spawn new power-ups occasionally (more frequent in higher levels)
+    def on_power_up_end(self):
+        self.power_up_active = False
+        self.current_power_type = None
+        self.current_power_color = None
+        if self.player.speed > 10:  # Reset speed boost
+            self.player.speed = 10
+
+    def update_power_up_spawning(self):
+        """Schedule the next power-up arrival (more frequent in higher levels)"""
+        # A power-up shows up with a 1 in spawn_chance chance per tick, so the wait for the
+        # next one is geometrically distributed; draw it once instead of rolling every tick
         spawn_chance = max(100, 300 - (self.current_level - 1) * 50)  # More frequent in higher levels
-        if random.randint(1, spawn_chance) == 1:
-            self.spawn_power_up()
+        spawn_chance = self.ticks(spawn_chance / 60)  # Same chance per second at any tick rate
+        delay = 1
+        if spawn_chance > 1:
+            delay += int(math.log(1.0 - self.rng.random()) / math.log(1 - 1 / spawn_chance))
+        self.schedule_event('power_up_spawn', delay)
+
+    def on_power_up_spawn(self):
+        self.spawn_power_up()
+        self.update_power_up_spawning()
 
-    def update_time_limit(self):
-        """Update time limit"""
-        self.time_remaining -= 1
-        if self.time_remaining <= 0:
-            self.game_over = True
+    def ticks(self, seconds):
+        """Convert a duration in seconds to simulation ticks"""
+        return max(1, round(seconds * self.tick_rate))
 
     def format_time(self, frames):
-        """Convert frames to MM:SS format"""
-        seconds = frames // 60
+        """Convert ticks to MM:SS format"""
+        seconds = frames // self.tick_rate
         minutes = seconds // 60
         seconds = seconds % 60
         return f"{minutes:02d}:{seconds:02d}"
 
+    def draw_position(self, obj):
+        """Where to draw a moving object, interpolated between the last two ticks"""
+        if self.render_alpha >= 1.0:
+            return (obj.x, obj.y)
+        if obj is self.player:
+            if self.player_previous is None:
+                return (obj.x, obj.y)
+            previous_x, previous_y = self.player_previous
+            return (previous_x + (obj.x - previous_x) * self.render_alpha,
+                    previous_y + (obj.y - previous_y) * self.render_alpha)
+        return self.world.interpolated_position(obj.slot, self.render_alpha)
+
+    def draw_sprite(self, image, position, special_flags=0):
+        """Blit onto the window and record the area for the dirty-rect renderer"""
+        rect = self.game_window.blit(image, position, special_flags=special_flags)
+        if self.dirty_renderer:
+            self.dirty_renderer.add(rect)
+        return rect
+
     def draw_objects(self):
-        # Clear the screen completely first
-        self.game_window.fill((0, 0, 0))
-        
-        # Draw background with proper scaling to fill the entire window
-        self.game_window.blit(self.background.image, (0, 0))
+        if self.dirty_renderer:
+            # Only restore the background where sprites were last frame
+            self.dirty_renderer.begin_frame()
+        else:
+            # Clear the screen completely first
+            self.game_window.fill((0, 0, 0))
+            
+            # Draw background with proper scaling to fill the entire window
+            self.game_window.blit(self.background.image, (0, 0))
         
         # Draw treasure box
-        self.game_window.blit(self.treasure_box.image, (self.treasure_box.x, self.treasure_box.y))
+        self.draw_sprite(self.treasure_box.image, (self.treasure_box.x, self.treasure_box.y))
         
         # Draw treasure items
         for item in self.treasure_items:
             if item.color:
-                item_surface = pygame.Surface((item.width, item.height))
-                item_surface.fill(item.color)
-                self.game_window.blit(item_surface, (item.x, item.y))
+                item_surface = image_cache.get_tinted(item.image_path, item.width, item.height,
+                                                      item.color, self.tint_mode)
+                self.draw_sprite(item_surface, self.draw_position(item))
             else:
-                self.game_window.blit(item.image, (item.x, item.y))
+                self.draw_sprite(item.image, self.draw_position(item))
         
         # Draw player
-        self.game_window.blit(self.player.image, (self.player.x, self.player.y))
+        self.draw_sprite(self.player.image, self.draw_position(self.player))
         
         # Draw magic particles around player
         self.draw_magic_particles()
         
         # Draw all enemies
         for enemy in self.enemies:
-            self.game_window.blit(enemy.image, (enemy.x, enemy.y))
+            self.draw_sprite(enemy.image, self.draw_position(enemy))
         
         # Draw power-ups with their colors
         for power_up in self.power_ups:
-            # Create a colored surface for the power-up
-            power_surface = pygame.Surface((power_up.width, power_up.height))
-            power_surface.fill(power_up.color)
-            self.game_window.blit(power_surface, (power_up.x, power_up.y))
+            # Colored surfaces are built once per color and reused
+            power_surface = image_cache.get_tinted(power_up.image_path, power_up.width, power_up.height,
+                                                   power_up.color, self.tint_mode)
+            self.draw_sprite(power_surface, (power_up.x, power_up.y))
 
         # Draw UI with semi-transparent background for better readability
         self.draw_ui()
         
         # Draw buttons
         self.quit_button.draw(self.game_window)
+        
+        # Profiler overlay (F3)
+        if self.profiler.overlay_visible:
+            overlay_rect = self.profiler.draw_overlay(self.game_window)
+            if self.dirty_renderer:
+                self.dirty_renderer.add(overlay_rect)
+        self.profiler.mark('draw_objects')
 
-        pygame.display.update()
+        if self.dirty_renderer:
+            self.dirty_renderer.add(self.quit_button.rect)
+            self.dirty_renderer.end_frame()
+        else:
+            pygame.display.update()
+        self.profiler.mark('display_update')
 
     def draw_ui(self):
         """Draw score, lives, and game over screen"""
-        font = pygame.font.Font(None, 36)
-        
-        # Create a semi-transparent overlay for UI elements
-        ui_surface = pygame.Surface((280, 270))
-        ui_surface.set_alpha(180)  # Semi-transparent
-        ui_surface.fill((0, 0, 0))  # Black background
-        self.game_window.blit(ui_surface, (5, 5))
+        hud = self.hud
         
-        # Level display
-        level_text = font.render(f"Level: {self.current_level}", True, (255, 255, 0))
-        self.game_window.blit(level_text, (10, 10))
-        
-        # Score with better contrast
-        score_text = font.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.game_window.blit(score_text, (10, 50))
-        
-        # Lives with better contrast
-        lives_text = font.render(f"Lives: {self.lives}", True, (255, 255, 255))
-        self.game_window.blit(lives_text, (10, 90))
+        # Only fields whose text or color changed get re-rendered into the HUD layer
+        hud.set_field('level', (10, 10), f"Level: {self.current_level}", (255, 255, 0))
+        hud.set_field('score', (10, 50), f"Score: {self.score}", (255, 255, 255))
+        hud.set_field('lives', (10, 90), f"Lives: {self.lives}", (255, 255, 255))
         
         # Time remaining
-        time_color = (255, 255, 255) if self.time_remaining > 600 else (255, 0, 0)  # Red when less than 10 seconds
-        time_text = font.render(f"Time: {self.format_time(self.time_remaining)}", True, time_color)
-        self.game_window.blit(time_text, (10, 130))
+        time_color = (255, 255, 255) if self.time_remaining > self.ticks(10) else (255, 0, 0)  # Red when less than 10 seconds
+        hud.set_field('time', (10, 130), f"Time: {self.format_time(self.time_remaining)}", time_color)
         
         # Enemy count
-        enemy_text = font.render(f"Enemies: {len(self.enemies)}", True, (255, 255, 255))
-        self.game_window.blit(enemy_text, (10, 170))
+        hud.set_field('enemies', (10, 170), f"Enemies: {len(self.enemies)}", (255, 255, 255))
         
         # Treasure items collected
         if self.treasure_opened:
-            items_text = font.render(f"Items: {self.items_collected}/{self.total_items}", True, (255, 255, 255))
-            self.game_window.blit(items_text, (10, 210))
-            
+            hud.set_field('objective', (10, 210), f"Items: {self.items_collected}/{self.total_items}", (255, 255, 255))
             if self.items_collected == self.total_items:
-                return_text = font.render("Return to treasure!", True, (255, 255, 0))
-                self.game_window.blit(return_text, (10, 250))
+                hud.set_field('return', (10, 250), "Return to treasure!", (255, 255, 0))
+            else:
+                hud.set_field('return', (10, 250), None, None)
         else:
-            objective_text = font.render("Touch treasure to open!", True, (255, 255, 0))
-            self.game_window.blit(objective_text, (10, 210))
+            hud.set_field('objective', (10, 210), "Touch treasure to open!", (255, 255, 0))
+            hud.set_field('return', (10, 250), None, None)
         
         # Power-up status
         if self.power_up_active:
-            power_text = font.render("POWER-UP ACTIVE!", True, (255, 255, 0))
-            self.game_window.blit(power_text, (10, 290))
+            hud.set_field('power', (10, 290), "POWER-UP ACTIVE!", (255, 255, 0))
+        else:
+            hud.set_field('power', (10, 290), None, None)
+        
+        self.draw_sprite(hud.layer, hud.position, pygame.BLEND_PREMULTIPLIED)
         
         # Level completion message
         if self.level_completed:
-            level_complete_font = pygame.font.Font(None, 48)
-            level_text = level_complete_font.render(f"LEVEL {self.current_level - 1} COMPLETE!", True, (0, 255, 0))
-            text_rect = level_text.get_rect(center=(self.width/2, self.height/2 - 50))
-            self.game_window.blit(level_text, text_rect)
-            
-            next_text = font.render("Preparing next level...", True, (255, 255, 255))
-            next_rect = next_text.get_rect(center=(self.width/2, self.height/2))
-            self.game_window.blit(next_text, next_rect)
+            self.level_complete_layer.set_lines([
+                (f"LEVEL {self.current_level - 1} COMPLETE!", 48, (0, 255, 0), (self.width/2, self.height/2 - 50)),
+                ("Preparing next level...", 36, (255, 255, 255), (self.width/2, self.height/2))
+            ])
+            self.draw_sprite(self.level_complete_layer.layer, self.level_complete_layer.bounds,
+                             pygame.BLEND_PREMULTIPLIED)
         
         # Game over screen with better visibility
         if self.game_over:
-            # Create a semi-transparent overlay for game over screen
-            overlay = pygame.Surface((self.width, self.height))
-            overlay.set_alpha(200)
-            overlay.fill((0, 0, 0))
-            self.game_window.blit(overlay, (0, 0))
-            
-            game_over_font = pygame.font.Font(None, 72)
             if self.lives <= 0:
-                game_over_text = game_over_font.render("GAME OVER", True, (255, 0, 0))
+                title = ("GAME OVER", 72, (255, 0, 0))
             elif self.time_remaining <= 0:
-                game_over_text = game_over_font.render("TIME'S UP!", True, (255, 165, 0))
+                title = ("TIME'S UP!", 72, (255, 165, 0))
             else:
-                game_over_text = game_over_font.render("YOU WIN!", True, (0, 255, 0))
+                title = ("YOU WIN!", 72, (0, 255, 0))
             
-            text_rect = game_over_text.get_rect(center=(self.width/2, self.height/2))
-            self.game_window.blit(game_over_text, text_rect)
-            
-            final_score_text = font.render(f"Final Score: {self.score}", True, (255, 255, 255))
-            final_score_rect = final_score_text.get_rect(center=(self.width/2, self.height/2 + 30))
-            self.game_window.blit(final_score_text, final_score_rect)
-            
-            restart_text = font.render("Press R to restart", True, (255, 255, 255))
-            restart_rect = restart_text.get_rect(center=(self.width/2, self.height/2 + 60))
-            self.game_window.blit(restart_text, restart_rect)
+            # Backdrop and text are composited once and reused until the score changes
+            self.game_over_layer.set_lines([
+                (*title, (self.width/2, self.height/2)),
+                (f"Final Score: {self.score}", 36, (255, 255, 255), (self.width/2, self.height/2 + 30)),
+                ("Press R to restart", 36, (255, 255, 255), (self.width/2, self.height/2 + 60))
+            ])
+            self.draw_sprite(self.game_over_layer.layer, self.game_over_layer.bounds,
+                             pygame.BLEND_PREMULTIPLIED)
     
-    def handle_input(self):
+    def handle_input(self, keys=None):
         """Handle keyboard input for player movement"""
-        if self.game_over:
+        if keys is None:
             keys = pygame.key.get_pressed()
+        
+        if self.game_over:
             if keys[pygame.K_r]:
                 self.restart_game()
             return
         
-        keys = pygame.key.get_pressed()
-        
         # Horizontal movement (left/right)
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.player.move_horizontal(-1, self.width)
+            self.player.move_horizontal(-self.motion_scale, self.width)
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.player.move_horizontal(1, self.width)
+            self.player.move_horizontal(self.motion_scale, self.width)
         
         # Vertical movement (up/down)
         if keys[pygame.K_UP] or keys[pygame.K_w]:
-            self.player.move_vertical(-1, self.height)
+            self.player.move_vertical(-self.motion_scale, self.height)
         if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            self.player.move_vertical(1, self.height)
+            self.player.move_vertical(self.motion_scale, self.height)
     
     def restart_game(self):
         """Restart the game"""
@@ -661,60 +889,146 @@ class Game:
         self.lives = 3
         self.game_over = False
         self.power_up_active = False
-        self.power_up_timer = 0
+        self.cancel_event('power_up_end')
         self.current_level = 1
         self.level_completed = False
-        self.time_remaining = self.base_time_limit
         self.treasure_opened = False
         self.items_collected = 0
+        self.item_pool.release_all(self.treasure_items)
         self.treasure_items = []
-        self.enemy_spawn_timer = 0
-        self.enemy_spawn_delay = 180
-        self.treasure_spawn_timer = 0
-        self.treasure_spawn_delay = 600
+        self.enemy_spawn_delay = self.ticks(3)
+        self.treasure_spawn_delay = self.ticks(10)
         self.max_treasure_items = 15
-        self.magic_particles = []
+        self.magic_particles.clear()
         
         self.player.x = 375
         self.player.y = 700
         self.player.speed = 10
+        self.player_previous = None
         
         # Reset to level 1
         self.setup_level()
     
     def update_enemies(self):
         """Update all enemy and treasure item movements"""
-        for enemy in self.enemies:
-            enemy.move(self.width)
-        for item in self.treasure_items:
-            item.move(self.width)
+        # One vectorized step moves and bounces every enemy and item
+        self.world.step(self.width, self.motion_scale, self.height)
         
     def spawn_additional_treasure(self):
-        """Spawn additional treasure items during gameplay"""
-        if len(self.treasure_items) < self.max_treasure_items and self.treasure_opened:
-            self.treasure_spawn_timer += 1
-            if self.treasure_spawn_timer >= self.treasure_spawn_delay:
-                self.treasure_spawn_timer = 0
-                
-                # Spawn in random location
-                x = random.randint(100, self.width - 130)
-                y = random.randint(100, self.height - 130)
-                
-                item_types = ["gem", "coin", "crown", "ruby", "emerald", "diamond", "sapphire", "gold"]
-                item_type = random.choice(item_types)
-                
-                item = TreasureItem(x, y, 30, 30, 'assets/enemy.png', item_type)
-                self.treasure_items.append(item)
-                
-                # Increase total items count
-                self.total_items += 1
+        """Spawn an additional treasure item during gameplay"""
+        # Spawn in random location
+        x = self.rng.randint(100, self.width - 130)
+        y = self.rng.randint(100, self.height - 130)
+        
+        item_types = ["gem", "coin", "crown", "ruby", "emerald", "diamond", "sapphire", "gold"]
+        item_type = self.rng.choice(item_types)
+        
+        item = self.item_pool.acquire(x, y, 30, 30, 'assets/enemy.png', item_type, world=self.world, rng=self.rng)
+        self.treasure_items.append(item)
+        
+        # Increase total items count
+        self.total_items += 1
 
     def update_treasure_spawning(self):
-        """Update treasure item spawning"""
-        self.spawn_additional_treasure()
+        """Keep the next treasure item scheduled while the chest is open and there is room"""
+        if (self.treasure_opened and len(self.treasure_items) < self.max_treasure_items
+                and not self.event_remaining('treasure_spawn')):
+            self.schedule_event('treasure_spawn', self.treasure_spawn_delay)
+
+    def on_treasure_spawn(self):
+        if self.treasure_opened and len(self.treasure_items) < self.max_treasure_items:
+            self.spawn_additional_treasure()
+        self.update_treasure_spawning()
+
+    def save_previous(self):
+        """Remember where things are before a tick (its input included) so rendering can
+        interpolate between ticks"""
+        self.world.save_previous()
+        self.player_previous = (self.player.x, self.player.y)
+
+    def update(self):
+        """Advance the game state by one tick (after save_previous() and handle_input())"""
+        self.tick_count += 1
+        
+        if not self.game_over and not self.level_completed:
+            profiler = self.profiler
+            self.player.update()
+            profiler.mark('player')
+            self.enemy_ai.update(self.enemies, self.player, self.tick_count)
+            profiler.mark('enemy_ai')
+            self.update_enemies()
+            profiler.mark('update_enemies')
+            # Spawns, power-up expiry and the level timeout fire from the timing wheel
+            self.timers.tick()
+            profiler.mark('timers')
+            self.update_magic_particles()
+            profiler.mark('particles')
+            
+            # Check collisions
+            self.check_enemy_collision()
+            self.check_treasure_collision()
+            self.check_treasure_item_collision()
+            self.check_power_up_collision()
+            profiler.mark('collisions')
+        
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.push(self.snapshot())
+            self.profiler.mark('snapshot')
+
+    def snapshot(self):
+        """The simulation state as bytes, for restore() (see gameState.py)"""
+        return gameState.capture(self)
+
+    def restore(self, data):
+        """Go back to a state returned by snapshot()"""
+        gameState.restore(self, data)
+
+    def rewind(self, seconds):
+        """Step back up to seconds of play using the rewind buffer; returns the ticks undone"""
+        if not self.rewind_buffer:
+            return 0
+        back = min(self.ticks(seconds), len(self.rewind_buffer) - 1)
+        self.rewind_buffer.truncate(back)
+        self.restore(self.rewind_buffer.get(0))
+        return back
+
+    def read_input(self):
+        """Keys held for this tick, recorded if a recording is running"""
+        keys = pygame.key.get_pressed()
+        if self.recorder:
+            self.recorder.record(keys_to_mask(keys))
+        return keys
+
+    def step(self, inputs=()):
+        """Run exactly one tick with the given held keys (pygame key codes)"""
+        if not isinstance(inputs, KeyState):
+            inputs = KeyState(inputs)
+        self.save_previous()
+        self.handle_input(inputs)
+        self.update()
 
     def run_game_loop(self):
+        self.gc_policy.start()
+        try:
+            self.run_frames()
+        finally:
+            self.gc_policy.stop()
+            if self.recorder:
+                self.recorder.save(self.record_path, self.score, self.current_level, self.lives)
+            if self.profile_output:
+                self.profiler.dump(self.profile_output)
+
+    def run_frames(self):
+        tick_seconds = 1 / self.tick_rate
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        profiler = self.profiler
+        first_frame = True
         while True: 
+            profiler.end_frame()
+            profiler.begin_frame()
+            voice_manager.begin_frame()  # Sound start limits are per rendered frame
+            
             # Handle events
             events = pygame.event.get()
             for event in events:
@@ -723,32 +1037,55 @@ class Game:
                 
                 # Handle quit button
                 if self.quit_button.handle_event(event):
+                    if self.recorder:
+                        self.recorder.record(QUIT_BIT)
                     return
+                
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+            profiler.mark('events')
 
-            # Handle input
-            self.handle_input()
+            if self.headless:
+                # Headless games tick as fast as possible and never draw
+                self.save_previous()
+                self.handle_input(self.read_input())
+                profiler.mark('handle_input')
+                self.update()
+                continue
             
-            # Update game state
-            if not self.game_over and not self.level_completed:
-                self.player.update()
-                self.update_enemies()
-                self.update_enemy_spawning()
-                self.update_power_ups()
-                self.update_time_limit()
-                self.update_magic_particles()
-                self.update_treasure_spawning()
-                
-                # Check collisions
-                self.check_enemy_collision()
-                self.check_treasure_collision()
-                self.check_treasure_item_collision()
-                self.check_power_up_collision()
-                
-                # Spawn magic particles
-                self.spawn_magic_particles()
+            if not self.ready:
+                # Still loading: run the next setup stage and keep the clock from counting it
+                self.run_deferred()
+                previous_time = time.perf_counter()
+                continue
+            
+            # Run as many fixed ticks as real time has covered since the last frame;
+            # they all share one frame's AI budget
+            self.enemy_ai.begin_frame()
+            now = time.perf_counter()
+            frame_time = now - previous_time
+            previous_time = now
+            self.frame_stats.record(frame_time)
+            accumulator += min(frame_time, 0.25)  # Don't spiral after a long stall
+            while accumulator >= tick_seconds:
+                self.save_previous()
+                self.handle_input(self.read_input())
+                profiler.mark('handle_input')
+                self.update()
+                accumulator -= tick_seconds
             
-            # Draw everything
+            # Draw everything, interpolated by how far we are into the next tick
+            self.render_alpha = accumulator / tick_seconds
             self.draw_objects()
+            if first_frame:
+                self.mark_startup('first frame')
+                first_frame = False
+            self.run_deferred()
             
             # Control frame rate
-            self.clock.tick(60)
\ No newline at end of file
+            if self.max_fps:
+                if self.busy_loop:
+                    self.clock.tick_busy_loop(self.max_fps)
+                else:
+                    self.clock.tick(self.max_fps)
+                profiler.mark('frame_wait')
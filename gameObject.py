@@ -1,13 +1,15 @@
-import pygame
+from imageCache import image_cache
 
 class GameObject:
+    # No per-instance __dict__; subclasses without __slots__ still get one
+    __slots__ = ('image', 'image_path', 'x', 'y', 'width', 'height')
 
     def __init__(self, x, y, width, height, image_path):
-        image = pygame.image.load(image_path)
-        self.image = pygame.transform.scale(image, (width, height))
+        # Surfaces are shared between objects, so never draw onto self.image
+        self.image = image_cache.get(image_path, width, height)
+        self.image_path = image_path
 
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-    
\ No newline at end of file
@@ -0,0 +1,239 @@
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+# Game fields saved as-is
+INT_FIELDS = ['score', 'lives', 'current_level', 'level_start_time', 'time_limit', 'items_collected',
+              'total_items', 'enemy_spawn_delay', 'max_enemies', 'treasure_spawn_delay', 'max_treasure_items',
+              'tick_count']
+BOOL_FIELDS = ['game_over', 'power_up_active', 'level_completed', 'treasure_opened']
+SCALARS = struct.Struct('<' + 'q' * len(INT_FIELDS) + '?' * len(BOOL_FIELDS) + 'd')  # + enemy_speed_multiplier
+
+# Player x, y, speed; current power type and color (index 0 / flag 0 = None)
+PLAYER = struct.Struct('<dddB?3B')
+# RNG: gauss_next flag and value, position in the Mersenne Twister state
+RNG = struct.Struct('<?dI')
+COUNTS = struct.Struct('<III')  # Enemies, treasure items, power-ups
+
+POWER_TYPES = [None, 'speed', 'shield', 'points']
+ITEM_TYPES = ["gem", "coin", "crown", "ruby", "emerald", "diamond", "sapphire", "gold"]
+ENTITY_IMAGE = 'assets/enemy.png'
+
+
+def entity_arrays(world, entities, fields):
+    """Gather fields of entities (by world slot) into one float64 array"""
+    slots = np.fromiter((entity.slot for entity in entities), dtype=np.intp, count=len(entities))
+    return np.stack([getattr(world, field)[slots] for field in fields], axis=1)
+
+
+def events_struct(game):
+    """Ticks left on each of the game's EVENTS (0 = not scheduled)"""
+    return struct.Struct('<' + 'q' * len(game.EVENTS))
+
+
+def color_bytes(color):
+    return (0, 0, 0, 0) if color is None else (1,) + tuple(color)
+
+
+def capture(game):
+    """Serialize the simulation state (not particles or rendering) to bytes"""
+    parts = [SCALARS.pack(*[getattr(game, name) for name in INT_FIELDS],
+                          *[getattr(game, name) for name in BOOL_FIELDS],
+                          game.enemy_speed_multiplier)]
+
+    player = game.player
+    color = getattr(game, 'current_power_color', None)
+    parts.append(PLAYER.pack(player.x, player.y, player.speed,
+                             POWER_TYPES.index(getattr(game, 'current_power_type', None)),
+                             color is not None, *(color or (0, 0, 0))))
+
+    version, state, gauss_next = game.rng.getstate()
+    parts.append(RNG.pack(gauss_next is not None, gauss_next or 0.0, state[-1]))
+    parts.append(np.array(state[:-1], dtype=np.uint32).tobytes())
+    parts.append(events_struct(game).pack(*[game.event_remaining(name) for name in game.EVENTS]))
+
+    world = game.world
+    enemies, items, power_ups = game.enemies, game.treasure_items, game.power_ups
+    parts.append(COUNTS.pack(len(enemies), len(items), len(power_ups)))
+    parts.append(entity_arrays(world, enemies, ('x', 'y', 'width', 'height', 'speed', 'speed_y')).tobytes())
+    parts.append(entity_arrays(game.enemy_ai, enemies, ('behaviour', 'max_speed', 'next_think')).tobytes())
+    parts.append(entity_arrays(world, items, ('x', 'y', 'width', 'height', 'speed')).tobytes())
+    parts.append(bytes(value for item in items for value in
+                       (ITEM_TYPES.index(item.item_type), item.collected, item.returned) + color_bytes(item.color)))
+    parts.append(entity_arrays(world, power_ups, ('x', 'y', 'width', 'height')).tobytes())
+    parts.append(bytes(value for power_up in power_ups for value in
+                       (POWER_TYPES.index(power_up.power_type), power_up.active) + tuple(power_up.color)))
+    return b''.join(parts)
+
+
+def restore(game, data):
+    """Put a game back into a captured state; entities are recycled through the game's pools"""
+    values = SCALARS.unpack_from(data)
+    offset = SCALARS.size
+    for name, value in zip(INT_FIELDS + BOOL_FIELDS, values):
+        setattr(game, name, value)
+    game.enemy_speed_multiplier = values[-1]
+
+    x, y, speed, power_type, has_color, r, g, b = PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+    game.player.x, game.player.y, game.player.speed = x, y, speed
+    game.current_power_type = POWER_TYPES[power_type]
+    game.current_power_color = (r, g, b) if has_color else None
+
+    has_gauss, gauss_next, position = RNG.unpack_from(data, offset)
+    offset += RNG.size
+    state = np.frombuffer(data, dtype=np.uint32, count=624, offset=offset)
+    offset += state.nbytes
+    game.rng.setstate((3, tuple(state.tolist()) + (position,), gauss_next if has_gauss else None))
+
+    # Rescheduled in EVENTS order, which is also their firing order, so ties replay the same way
+    events = events_struct(game)
+    for name, remaining in zip(game.EVENTS, events.unpack_from(data, offset)):
+        if remaining:
+            game.schedule_event(name, remaining)
+        else:
+            game.cancel_event(name)
+    offset += events.size
+
+    enemy_count, item_count, power_up_count = COUNTS.unpack_from(data, offset)
+    offset += COUNTS.size
+
+    def read_floats(rows, columns):
+        nonlocal offset
+        array = np.frombuffer(data, dtype=np.float64, count=rows * columns, offset=offset).reshape(rows, columns)
+        offset += array.nbytes
+        return array.tolist()
+
+    def read_bytes(rows, columns):
+        nonlocal offset
+        chunk = data[offset:offset + rows * columns]
+        offset += rows * columns
+        return [chunk[row * columns:(row + 1) * columns] for row in range(rows)]
+
+    game.enemy_pool.release_all(game.enemies)
+    game.item_pool.release_all(game.treasure_items)
+    game.power_up_pool.release_all(game.power_ups)
+
+    game.enemies = []
+    enemy_values = read_floats(enemy_count, 6)
+    for (x, y, width, height, speed, speed_y), (behaviour, max_speed, next_think) in zip(
+            enemy_values, read_floats(enemy_count, 3)):
+        enemy = game.enemy_pool.acquire(x, y, width, height, ENTITY_IMAGE, speed, world=game.world)
+        enemy.speed_y = speed_y
+        game.enemy_ai.add(enemy.slot, int(behaviour), int(next_think), max_speed)
+        game.enemies.append(enemy)
+
+    game.treasure_items = []
+    item_values = read_floats(item_count, 5)
+    for (x, y, width, height, speed), flags in zip(item_values, read_bytes(item_count, 7)):
+        item = game.item_pool.acquire(x, y, width, height, ENTITY_IMAGE, ITEM_TYPES[flags[0]], world=game.world)
+        item.speed = speed
+        item.collected, item.returned = bool(flags[1]), bool(flags[2])
+        item.color = tuple(flags[4:7]) if flags[3] else None
+        game.treasure_items.append(item)
+
+    game.power_ups = []
+    power_up_values = read_floats(power_up_count, 4)
+    for (x, y, width, height), flags in zip(power_up_values, read_bytes(power_up_count, 5)):
+        power_up = game.power_up_pool.acquire(x, y, width, height, ENTITY_IMAGE, POWER_TYPES[flags[0]],
+                                              tuple(flags[2:5]), world=game.world)
+        power_up.active = bool(flags[1])
+        game.power_ups.append(power_up)
+
+    # Nothing to interpolate from, and particles are only decoration
+    game.world.previous_x[:] = np.nan
+    game.world.previous_y[:] = np.nan
+    game.player_previous = None
+    game.magic_particles.clear()
+
+
+class SnapshotRing:
+    """Bounded history of snapshots, each stored as a zlib'd XOR delta against the one before
+
+    Every keyframe_interval snapshots a full (compressed) keyframe starts a new group.
+    The oldest group is dropped once the others cover max_snapshots, or earlier if the
+    buffer grows past max_bytes. If the group being written is over max_bytes on its
+    own, the history restarts from the newest snapshot as a fresh keyframe, so bytes
+    stays within max_bytes unless a single keyframe is bigger than that.
+    """
+
+    def __init__(self, max_snapshots=600, max_bytes=4 * 1024 * 1024, keyframe_interval=60):
+        self.max_snapshots = max_snapshots
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.groups = deque()  # [keyframe, [delta, ...]], oldest first
+        self.previous = None  # Newest snapshot, uncompressed, to diff the next one against
+        self.count = 0
+        self.bytes = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, data):
+        if (self.previous is None or len(data) != len(self.previous)
+                or len(self.groups[-1][1]) + 1 >= self.keyframe_interval):
+            entry = zlib.compress(data, 1)
+            self.groups.append([entry, []])
+        else:
+            delta = np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), np.frombuffer(self.previous, dtype=np.uint8))
+            entry = zlib.compress(delta.tobytes(), 1)
+            self.groups[-1][1].append(entry)
+        self.previous = data
+        self.count += 1
+        self.bytes += len(entry)
+
+        # Drop whole groups from the old end (never the one being written) while the
+        # rest still covers max_snapshots, or whenever the byte budget is exceeded
+        while len(self.groups) > 1:
+            keyframe, deltas = self.groups[0]
+            if self.count - 1 - len(deltas) < self.max_snapshots and self.bytes <= self.max_bytes:
+                break
+            self.groups.popleft()
+            self.count -= 1 + len(deltas)
+            self.bytes -= len(keyframe) + sum(len(delta) for delta in deltas)
+
+        if self.bytes > self.max_bytes and self.count > 1:
+            keyframe = zlib.compress(data, 1)
+            self.groups = deque([[keyframe, []]])
+            self.count = 1
+            self.bytes = len(keyframe)
+
+    def get(self, back=0):
+        """The snapshot taken back pushes before the newest one"""
+        if not 0 <= back < self.count:
+            raise IndexError("snapshot not in the buffer")
+        if back == 0:
+            return self.previous
+        index = self.count - 1 - back
+        for keyframe, deltas in self.groups:
+            if index <= len(deltas):
+                snapshot = np.frombuffer(zlib.decompress(keyframe), dtype=np.uint8)
+                for delta in deltas[:index]:
+                    snapshot = snapshot ^ np.frombuffer(zlib.decompress(delta), dtype=np.uint8)
+                return snapshot.tobytes()
+            index -= 1 + len(deltas)
+
+    def truncate(self, back):
+        """Forget the newest back snapshots (after rewinding past them)"""
+        if back <= 0:
+            return
+        newest = self.get(back)
+        for _ in range(back):
+            keyframe, deltas = self.groups[-1]
+            if deltas:
+                self.bytes -= len(deltas.pop())
+            else:
+                self.bytes -= len(keyframe)
+                self.groups.pop()
+            self.count -= 1
+        self.previous = newest
+
+    def get_stats(self):
+        return {
+            'snapshots': self.count,
+            'keyframes': len(self.groups),
+            'bytes': self.bytes,
+            'snapshot_bytes': len(self.previous) if self.previous is not None else 0
+        }
@@ -0,0 +1,112 @@
+import numpy as np
+import pygame
+from textCache import text_cache
+
+
+def blit_premultiplied(layer, source, position):
+    """Composite a straight-alpha surface over a premultiplied-alpha layer; returns the rect
+
+    Done by hand because pygame's BLEND_PREMULTIPLIED between two alpha surfaces
+    misplaces pixels on some builds (blitting a premultiplied layer onto the screen is fine).
+    """
+    rect = source.get_rect(topleft=position).clip(layer.get_rect())
+    if not rect.width or not rect.height:
+        return rect
+    if not source.get_flags() & pygame.SRCALPHA:
+        source = source.convert_alpha()
+    area = rect.move(-position[0], -position[1])
+
+    source_rgb = pygame.surfarray.pixels3d(source)[area.left:area.right, area.top:area.bottom].astype(np.uint32)
+    source_alpha = pygame.surfarray.pixels_alpha(source)[area.left:area.right, area.top:area.bottom].astype(np.uint32)
+    layer_rgb = pygame.surfarray.pixels3d(layer)[rect.left:rect.right, rect.top:rect.bottom]
+    layer_alpha = pygame.surfarray.pixels_alpha(layer)[rect.left:rect.right, rect.top:rect.bottom]
+
+    # Premultiplied "over": result = source * a + layer * (1 - a), for colour and alpha alike
+    keep = 255 - source_alpha
+    layer_rgb[...] = (source_rgb * source_alpha[..., None] + layer_rgb * keep[..., None] + 127) // 255
+    layer_alpha[...] = source_alpha + (layer_alpha * keep + 127) // 255
+    return rect
+
+
+class HudLayer:
+    """Retained HUD: the panel is built once and value fields are redrawn only when they change
+
+    The layer holds premultiplied alpha, so blit it with pygame.BLEND_PREMULTIPLIED; that
+    gives the same pixels as drawing the panel and then each text straight onto the screen.
+    """
+
+    def __init__(self, position=(5, 5), size=(310, 320), panel_size=(280, 270), panel_alpha=180):
+        self.position = position
+
+        # Static part: the semi-transparent panel, kept to erase fields from
+        self.base = pygame.Surface(size, pygame.SRCALPHA)
+        self.base.fill((0, 0, 0, panel_alpha), pygame.Rect((0, 0), panel_size))
+        self.layer = self.base.copy()
+
+        self.fields = {}  # Field name -> (value, rect on the layer)
+
+        # Statistics
+        self.field_redraws = 0
+
+    def restore(self, rect):
+        """Put the static panel back under a field"""
+        self.layer.fill((0, 0, 0, 0), rect)
+        self.layer.blit(self.base, rect.topleft, rect, special_flags=pygame.BLEND_RGBA_ADD)
+
+    def set_field(self, name, position, text, color, size=36):
+        """Show text at a screen position (None hides the field); no-op if unchanged"""
+        value = (text, color, size, position)
+        field = self.fields.get(name)
+        if field is not None:
+            if field[0] == value:
+                return
+            self.restore(field[1])
+
+        rect = pygame.Rect(0, 0, 0, 0)
+        if text is not None:
+            text_surface = text_cache.render(text, size, color)
+            layer_position = (position[0] - self.position[0], position[1] - self.position[1])
+            rect = blit_premultiplied(self.layer, text_surface, layer_position)
+        self.fields[name] = (value, rect)
+        self.field_redraws += 1
+
+
+class BackdropLayer:
+    """Full-screen overlay (optional dark backdrop plus centred lines) rebuilt only when its text changes
+
+    Like HudLayer, the layer is premultiplied and meant for BLEND_PREMULTIPLIED blits.
+    """
+
+    def __init__(self, size, alpha=0):
+        self.size = size
+        self.alpha = alpha
+        self.lines = None
+        self.layer = None
+        self.bounds = None
+
+        # Statistics
+        self.rebuilds = 0
+
+    def set_lines(self, lines):
+        """lines: (text, font size, color, center) tuples; rebuilds the layer if they changed"""
+        lines = tuple(lines)
+        if lines == self.lines:
+            return
+        self.lines = lines
+
+        rendered = []
+        for text, size, color, center in lines:
+            text_surface = text_cache.render(text, size, color)
+            rendered.append((text_surface, text_surface.get_rect(center=center)))
+
+        # Without a backdrop the layer only needs to cover the text
+        if self.alpha or not rendered:
+            self.bounds = pygame.Rect((0, 0), self.size)
+        else:
+            self.bounds = rendered[0][1].unionall([rect for _, rect in rendered])
+
+        self.layer = pygame.Surface(self.bounds.size, pygame.SRCALPHA)
+        self.layer.fill((0, 0, 0, self.alpha))
+        for text_surface, rect in rendered:
+            blit_premultiplied(self.layer, text_surface, rect.move(-self.bounds.x, -self.bounds.y).topleft)
+        self.rebuilds += 1
@@ -0,0 +1,112 @@
+import pygame
+from collections import OrderedDict
+from assetPack import AssetPack, DEFAULT_PACK
+
+
+class ImageCache:
+    """Process-wide cache of loaded, scaled and tinted surfaces keyed by (path, size)"""
+
+    def __init__(self, max_entries=64, pack_path=DEFAULT_PACK):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # (path, (width, height)) -> Surface, oldest first
+
+        # Pre-scaled sprites from assetPack.py, opened on the first miss
+        self.pack_path = pack_path
+        self.pack = None
+        self.pack_opened = False
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.tinted_hits = 0
+        self.tinted_misses = 0  # Each miss is one new Surface
+
+    def get(self, image_path, width, height):
+        """Return the scaled surface for an image, loading it only on a miss"""
+        key = (image_path, (width, height))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)  # Mark as most recently used
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.load_image(image_path, width, height)
+        self.store(key, surface)
+        return surface
+
+    def get_tinted(self, image_path, width, height, color, mode='fill'):
+        """Return a coloured version of an image, built once per (image, size, colour, mode)
+
+        mode 'fill' gives a flat square of the colour, 'tint' multiplies the sprite by it.
+        """
+        key = (image_path, (width, height), tuple(color), mode)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.tinted_hits += 1
+            return surface
+
+        self.tinted_misses += 1
+        if mode == 'tint':
+            surface = self.get(image_path, width, height).copy()
+            surface.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+        else:
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+        self.store(key, surface)
+        return surface
+
+    def store(self, key, surface):
+        """Add a surface, dropping the least recently used ones once over the limit"""
+        self.surfaces[key] = surface
+        while len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+
+    def load_image(self, image_path, width, height):
+        """Decode, scale and convert an image to the display format
+
+        Sprites found in the asset pack skip the decode and the scale; anything
+        else comes from the loose file.
+        """
+        if not self.pack_opened:
+            self.pack = AssetPack.open(self.pack_path)
+            self.pack_opened = True
+
+        image = self.pack.get(image_path, width, height) if self.pack else None
+        if image is None:
+            image = pygame.image.load(image_path)
+            image = pygame.transform.scale(image, (width, height))
+
+        # Converting needs a display; before set_mode we keep the raw surface
+        if pygame.display.get_surface() is not None:
+            if image.get_flags() & pygame.SRCALPHA:
+                image = image.convert_alpha()
+            else:
+                image = image.convert()
+        return image
+
+    def clear(self):
+        """Forget every cached surface (e.g. after the display mode changes)"""
+        self.surfaces.clear()
+
+    def get_stats(self):
+        """Get cache hit/miss counters"""
+        return {
+            'entries': len(self.surfaces),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'tinted_hits': self.tinted_hits,
+            'tinted_misses': self.tinted_misses,
+            'evictions': self.evictions,
+            'pack_hits': self.pack.hits if self.pack else 0
+        }
+
+
+# Shared by every GameObject so repeated spawns never touch the disk
+image_cache = ImageCache()
@@ -0,0 +1,164 @@
+"""Record sessions as a seed plus per-tick key bitmasks, and replay them headless.
+
+Recording:  python main.py with Game(record_path='session.rpl')
+Playback:   python inputReplay.py session.rpl
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+import pygame
+
+MAGIC = b'RPLY'
+VERSION = 1
+# Magic, version, tick rate, seed, then the final score, level and lives to check against
+HEADER = struct.Struct('<4sBHQqii')
+
+# Every key handle_input reads, one bit each
+KEY_BITS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+            pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_r]
+QUIT_BIT = 1 << 15  # The quit button was clicked; playback stops here
+
+
+def keys_to_mask(keys):
+    """Bitmask of KEY_BITS from pygame.key.get_pressed() (or anything indexable the same way)"""
+    mask = 0
+    for bit, key in enumerate(KEY_BITS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_keys(mask):
+    """The key codes held in a mask, ready for Game.step()"""
+    return [key for bit, key in enumerate(KEY_BITS) if mask & (1 << bit)]
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class InputRecorder:
+    """Run-length encodes one key mask per tick: held keys rarely change, so runs are long"""
+
+    def __init__(self, seed, tick_rate=60):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.runs = []  # [mask, ticks]
+        self.ticks = 0
+
+    def record(self, mask):
+        if self.runs and self.runs[-1][0] == mask:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.ticks += 1
+
+    def to_bytes(self, score, level, lives):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.tick_rate, self.seed, score, level, lives))
+        write_varint(out, len(self.runs))
+        for mask, ticks in self.runs:
+            write_varint(out, ticks)
+            write_varint(out, mask)
+        return bytes(out)
+
+    def save(self, path, score, level, lives):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(score, level, lives))
+
+
+class Replay:
+    """A loaded recording"""
+
+    def __init__(self, data):
+        magic, version, self.tick_rate, self.seed, score, level, lives = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a replay file (or an unsupported version)")
+        self.final = {'score': score, 'level': level, 'lives': lives}
+
+        run_count, position = read_varint(data, HEADER.size)
+        self.runs = []
+        for _ in range(run_count):
+            ticks, position = read_varint(data, position)
+            mask, position = read_varint(data, position)
+            self.runs.append((mask, ticks))
+        self.ticks = sum(ticks for _, ticks in self.runs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def masks(self):
+        """One mask per tick"""
+        for mask, ticks in self.runs:
+            for _ in range(ticks):
+                yield mask
+
+
+def play_replay(replay, game_factory=None):
+    """Run a recording headless as fast as possible; returns the end state and whether it matches"""
+    if game_factory is None:
+        from game import Game
+        game_factory = lambda seed, tick_rate: Game(headless=True, seed=seed, tick_rate=tick_rate)
+    game = game_factory(replay.seed, replay.tick_rate)
+
+    start = time.perf_counter()
+    ticks = 0
+    for mask in replay.masks():
+        if mask & QUIT_BIT:
+            break
+        game.step(mask_to_keys(mask))
+        ticks += 1
+    elapsed = time.perf_counter() - start
+
+    final = {'score': game.score, 'level': game.current_level, 'lives': game.lives}
+    return {
+        'ticks': ticks,
+        'seconds': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed else float('inf'),
+        'final': final,
+        'expected': replay.final,
+        'matches': final == replay.final
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless and verify it")
+    parser.add_argument('replay', help="file written with Game(record_path=...)")
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    replay = Replay.load(args.replay)
+    result = play_replay(replay)
+    print(f"{result['ticks']} ticks ({result['ticks'] / replay.tick_rate:.0f}s of play) "
+          f"in {result['seconds']:.2f}s, {result['ticks_per_second']:.0f} ticks/s, "
+          f"{os.path.getsize(args.replay)} bytes")
+    if result['matches']:
+        print(f"OK: {result['final']}")
+    else:
+        print(f"MISMATCH: expected {result['expected']}, got {result['final']}")
+        sys.exit(1)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,18 @@
+from startupTimer import startup_timer
 import pygame
 from game import Game
+from audioService import audio
+startup_timer.mark('imports')
 
-pygame.init()
-
-# Play background music (simple, one file, no interruption)
-try:
-    pygame.mixer.init()
-    pygame.mixer.music.load('assets/music/puppy no woof.mp3')
-    pygame.mixer.music.set_volume(1.0)
-    pygame.mixer.music.play(-1)  # Loop indefinitely
-except Exception as e:
-    print(f"[WARNING] Could not play background music: {e}")
+# Only what the first frame needs; the mixer starts once the game is on screen
+pygame.display.init()
+pygame.font.init()
+startup_timer.mark('pygame init')
 
 game = Game()
+
+# Play background music (simple, one file, no interruption); streamed, never fully decoded
+game.defer(lambda: audio.play_music('assets/music/puppy no woof.mp3', volume=1.0), 'audio')
 game.run_game_loop()
 
 pygame.quit()
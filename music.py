@@ -1,12 +1,22 @@
 import pygame
 import os
 import random
-import numpy as np #ignore this for now 
+import threading
+from assetLoader import AssetLoader, build_audio_manifest
+from musicSynth import tone_samples, PatternSynth, MusicStream
+from voiceManager import voice_manager
+from musicPlaylist import Playlist
+from audioService import audio
 
 class Music:
-    def __init__(self):
-        """Initialize the music system"""
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+    def __init__(self, preload=True, music_mode='gapless'):
+        """Initialize the music system
+
+        Audio files load on a background thread. With preload=False a sound effect is
+        only decoded the first time it is played; until then the default beep stands in.
+        music_mode is the playlist's track switch: 'gapless' or 'crossfade'.
+        """
+        audio.init()
         
         # Audio settings
         self.music_volume = 0.3  # 30% volume for background music
@@ -14,79 +24,81 @@ class Music:
         self.music_enabled = True
         self.sfx_enabled = True
         
-        # Background music
-        self.current_music = None
+        # Background music; tracks load and switch on the playlist's own thread
         self.music_list = []
-        self.music_index = 0
+        self.playlist = Playlist(mode=music_mode, volume=self.music_volume,
+                                 on_unavailable=self.play_fallback_music_loop)
+        
+        # Procedural music plays on the voice manager's reserved music channel
+        self.music_channel = voice_manager.music_channel
+        self.music_stream = None
         
         # Sound effects
-        self.sounds = {}
+        self.sounds = {}  # Only sounds that finished loading
+        self.sound_paths = {}  # Sound name -> file, filled in by the manifest
+        self.sound_handles = {}
+        self.preload = preload
+        
+        # End-of-level cues always get a UI channel; pickups may be dropped in a busy frame
+        for sound_name in ['win', 'lose', 'level_complete']:
+            voice_manager.configure(sound_name, priority=3, max_instances=1, ui=True)
+        voice_manager.configure('powerup', priority=2, max_instances=2, max_per_frame=1)
+        voice_manager.configure('item', priority=1, max_instances=3, max_per_frame=2)
+        
+        # Background loading
+        self.loader = AssetLoader()
+        self.lock = threading.Lock()
+        self.music_pending = False  # Music was asked for before the manifest was ready
         
         # Initialize audio files
         self.default_beep = self.create_beep_sound(440, 300)  # 440Hz, 0.3s
         self.load_audio_files()
         
     def load_audio_files(self):
-        """Load all audio files from the assets folder"""
+        """Start loading the audio manifest in the background; returns immediately"""
         assets_dir = "assets"
-        print(f"[DEBUG] Looking for assets directory at: {os.path.abspath(assets_dir)}")
-        
-        # Check if assets directory exists
-        if not os.path.exists(assets_dir):
-            print("Assets directory not found. Creating simple audio...")
-            self.create_simple_audio()
-            return
-            
-        # Load background music
-        music_dir = os.path.join(assets_dir, "music")
-        print(f"[DEBUG] Looking for music directory at: {os.path.abspath(music_dir)}")
-        if os.path.exists(music_dir):
-            music_files = []
-            print(f"[DEBUG] Files in music directory: {os.listdir(music_dir)}")
-            for file in os.listdir(music_dir):
-                if file.lower().endswith(('.mp3', '.wav', '.ogg')):
-                    music_path = os.path.join(music_dir, file)
-                    music_files.append(music_path)
-                    print(f"[DEBUG] Found music file: {music_path}")
-            
-            if music_files:
-                self.music_list = music_files
-                print(f"Loaded {len(music_files)} music files")
-            else:
-                print("No music files found in music directory")
-        else:
-            print("Music directory not found")
-        
-        # Load sound effects
-        sfx_dir = os.path.join(assets_dir, "sounds")
-        if os.path.exists(sfx_dir):
-            for file in os.listdir(sfx_dir):
-                if file.lower().endswith(('.mp3', '.wav', '.ogg')):
-                    sfx_path = os.path.join(sfx_dir, file)
-                    sound_name = os.path.splitext(file)[0]  # Remove extension
-                    try:
-                        self.sounds[sound_name] = pygame.mixer.Sound(sfx_path)
-                        self.sounds[sound_name].set_volume(self.sfx_volume)
-                        print(f"Loaded sound: {file}")
-                    except Exception as e:
-                        print(f"Failed to load sound {file}: {e}")
-        else:
-            print("Sounds directory not found")
-        
+        self.manifest_handle = self.loader.load('audio manifest', build_audio_manifest, assets_dir,
+                                                on_ready=self.on_manifest_ready)
+
+    def on_manifest_ready(self, handle):
+        """Runs on the loader thread once the asset folders have been listed"""
+        manifest = handle.value
+        self.sound_paths = manifest['sounds']
+
         # If no audio files found, create simple ones
-        if not self.music_list and not self.sounds:
+        if not manifest['music'] and not self.sound_paths:
             print("No audio files found, creating simple audio...")
             self.create_simple_audio()
-        
-        # Fallback: if no music, set music_list to [None] to trigger beep fallback
-        if not self.music_list:
-            print("No music files available, will use fallback beep")
-            self.music_list = [None]
-        
-        # Fallback: if no sfx, set all keys to default beep
-        for key in ['win', 'lose', 'powerup', 'item', 'level_complete']:
-            if key not in self.sounds:
-                self.sounds[key] = self.default_beep
+
+        with self.lock:
+            # Fallback: if no music, set music_list to [None] to trigger beep fallback
+            self.music_list = manifest['music'] or [None]
+            self.playlist.set_tracks(manifest['music'])
+            music_pending, self.music_pending = self.music_pending, False
+        if music_pending:
+            self.play_background_music()
+
+        if self.preload:
+            for sound_name in self.sound_paths:
+                self.request_sound(sound_name)
+
+    def request_sound(self, sound_name):
+        """Queue a sound effect for decoding if it is known and not loading yet; returns its handle"""
+        handle = self.sound_handles.get(sound_name)
+        if handle is None and sound_name in self.sound_paths:
+            handle = self.loader.load(sound_name, self.load_sound, self.sound_paths[sound_name],
+                                      on_ready=self.on_sound_ready)
+            self.sound_handles[sound_name] = handle
+        return handle
+
+    def load_sound(self, sfx_path):
+        """Decode one sound effect (runs on the loader thread)"""
+        return audio.load_sound(sfx_path)
+
+    def on_sound_ready(self, handle):
+        # Sounds missing from self.sounds play the default beep, so publish only finished ones
+        handle.value.set_volume(self.sfx_volume)
+        self.sounds[handle.name] = handle.value
     
     def create_simple_audio(self):
         """Create simple audio if no files are available"""
@@ -101,7 +113,7 @@ class Music:
     def create_simple_music(self):
         """Create a simple background music pattern"""
         try:
-            # Create a simple melody using pygame's built-in functions
+            # A simple melody streamed by play_simple_music
             # This is a fallback when no music files are available
             sample_rate = 44100
             duration = 2000  # 2 seconds per pattern
@@ -142,19 +154,10 @@ class Music:
     def create_beep_sound(self, frequency, duration):
         """Create a simple beep sound"""
         try:
-            sample_rate = 44100
-            samples = int(sample_rate * duration / 1000)
-            
-            # Create a simple sine wave
-            t = np.linspace(0, duration/1000, samples)
-            wave = np.sin(2 * np.pi * frequency * t) * 0.3
-            
-            # Convert to 16-bit integer
-            stereo_wave = np.column_stack((wave, wave))
-            wave_int16 = (stereo_wave * 32767).astype(np.int16)
+            sample_rate, _, channels = pygame.mixer.get_init()
             
-            # Create pygame sound
-            sound = pygame.sndarray.make_sound(wave_int16)
+            # The samples are synthesized once per tone and shared
+            sound = audio.make_sound(tone_samples(frequency, duration, sample_rate, channels))
             sound.set_volume(self.sfx_volume)
             return sound
             
@@ -176,88 +179,79 @@ class Music:
             return None
     
     def play_background_music(self, music_file=None):
-        """Play background music"""
+        """Play background music (a specific file loops, otherwise the playlist plays in order)"""
         if not self.music_enabled:
             return
             
-        try:
-            # Stop any currently playing music
-            pygame.mixer.music.stop()
-            
-            if music_file:
-                # Play specific music file
-                if os.path.exists(music_file):
-                    pygame.mixer.music.load(music_file)
-                    pygame.mixer.music.play(-1)  # Loop indefinitely
-                    pygame.mixer.music.set_volume(self.music_volume)
-                    self.current_music = music_file
-                    print(f"Playing music: {music_file}")
+        if music_file is None:
+            with self.lock:
+                if not self.music_list:
+                    # Still listing the assets; play as soon as the manifest is in
+                    self.music_pending = True
                     return
-                else:
-                    print(f"Music file not found: {music_file}")
-            elif self.music_list and self.music_list[0] is not None:
-                # Play from music list
-                music_file = self.music_list[self.music_index]
-                if music_file and os.path.exists(music_file):
-                    pygame.mixer.music.load(music_file)
-                    pygame.mixer.music.play(-1)  # Loop indefinitely
-                    pygame.mixer.music.set_volume(self.music_volume)
-                    self.current_music = music_file
-                    print(f"Playing music: {music_file}")
-                    return
-                else:
-                    print(f"Music file not found in list: {music_file}")
-            else:
-                # No music files available
-                print("No music files available")
-                
-            # Fallback: play beep in a loop
-            self.play_fallback_music_loop()
-                
-        except Exception as e:
-            print(f"Error playing background music: {e}")
-            self.play_fallback_music_loop()
+        
+        # Leave the music channel to the file; the playlist falls back to it if nothing plays
+        if self.music_stream:
+            self.music_stream.stop()
+        self.music_channel.stop()
+        self.playlist.play(music_file)
     
     def play_fallback_music_loop(self):
-        """Play the default beep in a loop (simulate music)"""
+        """Play the procedural pattern when there is no music file (the default beep if that fails)"""
         try:
             # Stop any current music
             pygame.mixer.music.stop()
             
+            if self.play_simple_music():
+                return
+            
             # Play the default beep in a loop
             if self.default_beep:
                 # Stop any currently playing beep
                 self.default_beep.stop()
-                self.default_beep.play(loops=-1)
+                self.music_channel.play(self.default_beep, loops=-1)
                 print("Playing fallback beep music")
             else:
                 print("No fallback beep available")
         except Exception as e:
             print(f"Error playing fallback music: {e}")
     
+    def play_simple_music(self):
+        """Stream simple_music_pattern on the music channel; returns False if it can't"""
+        try:
+            if not hasattr(self, 'simple_music_pattern'):
+                self.create_simple_music()
+            if self.music_stream is None:
+                sample_rate, _, channels = pygame.mixer.get_init()
+                synth = PatternSynth(self.simple_music_pattern, sample_rate, channels)
+                self.music_stream = MusicStream(synth, self.music_channel)
+            self.music_channel.set_volume(self.music_volume)
+            self.music_stream.start()
+            return True
+        except Exception as e:
+            print(f"Failed to play simple music: {e}")
+            return False
+    
     def next_music(self):
-        """Play next music in the list"""
-        if self.music_list and len(self.music_list) > 1:
-            self.music_index = (self.music_index + 1) % len(self.music_list)
-            self.play_background_music()
-        elif self.music_list and len(self.music_list) == 1:
-            # If only one music file, restart it
+        """Play next music in the list (restarts it if there is only one)"""
+        if self.music_list and self.music_list[0] is not None:
+            self.playlist.skip(1)
+        elif self.music_list:
             self.play_background_music()
     
     def previous_music(self):
         """Play previous music in the list"""
-        if self.music_list and len(self.music_list) > 1:
-            self.music_index = (self.music_index - 1) % len(self.music_list)
-            self.play_background_music()
-        elif self.music_list and len(self.music_list) == 1:
-            # If only one music file, restart it
+        if self.music_list and self.music_list[0] is not None:
+            self.playlist.skip(-1)
+        elif self.music_list:
             self.play_background_music()
     
     def stop_music(self):
         """Stop background music"""
         try:
-            pygame.mixer.music.stop()
-            self.current_music = None
+            self.playlist.stop()
+            if self.music_stream:
+                self.music_stream.stop()
             if self.default_beep:
                 self.default_beep.stop()
         except Exception as e:
@@ -267,6 +261,7 @@ class Music:
         """Pause background music"""
         try:
             pygame.mixer.music.pause()
+            self.music_channel.pause()
         except Exception as e:
             print(f"Failed to pause music: {e}")
     
@@ -274,21 +269,24 @@ class Music:
         """Unpause background music"""
         try:
             pygame.mixer.music.unpause()
+            self.music_channel.unpause()
         except Exception as e:
             print(f"Failed to unpause music: {e}")
     
     def set_music_volume(self, volume):
         """Set background music volume (0.0 to 1.0)"""
         self.music_volume = max(0.0, min(1.0, volume))
+        self.playlist.volume = self.music_volume
         try:
             pygame.mixer.music.set_volume(self.music_volume)
+            self.music_channel.set_volume(self.music_volume)
         except Exception as e:
             print(f"Failed to set music volume: {e}")
     
     def set_sfx_volume(self, volume):
         """Set sound effects volume (0.0 to 1.0)"""
         self.sfx_volume = max(0.0, min(1.0, volume))
-        for sound in self.sounds.values():
+        for sound in list(self.sounds.values()):
             if sound:
                 sound.set_volume(self.sfx_volume)
     
@@ -298,12 +296,14 @@ class Music:
             return
             
         try:
-            if sound_name in self.sounds and self.sounds[sound_name]:
-                self.sounds[sound_name].play()
-            else:
-                self.default_beep.play()
+            sound = self.sounds.get(sound_name)
+            if not sound:
+                # Not loaded yet (or missing): don't wait for the decoder
+                self.request_sound(sound_name)
+                sound = self.default_beep
+            voice_manager.play(sound_name, sound)
         except Exception as e:
-            self.default_beep.play()
+            voice_manager.play(sound_name, self.default_beep)
     
     def play_win_sound(self):
         """Play victory sound"""
@@ -339,20 +339,23 @@ class Music:
     
     def get_music_info(self):
         """Get information about current music"""
-        if self.current_music:
+        if self.playlist.current:
             return {
-                'current': os.path.basename(self.current_music),
-                'index': self.music_index,
+                'current': os.path.basename(self.playlist.current),
+                'index': self.playlist.index,
                 'total': len(self.music_list),
                 'volume': self.music_volume,
-                'enabled': self.music_enabled
+                'enabled': self.music_enabled,
+                'last_transition_ms': self.playlist.get_stats()['last_transition_ms']
             }
         return None
     
     def cleanup(self):
         """Clean up audio resources"""
         try:
+            self.loader.shutdown()
             self.stop_music()
-            pygame.mixer.quit()
+            self.playlist.shutdown()
+            audio.quit()
         except Exception as e:
             print(f"Failed to cleanup audio: {e}") 
\ No newline at end of file
@@ -0,0 +1,182 @@
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+
+class Playlist:
+    """Plays a list of music files on pygame.mixer.music from a background thread
+
+    Every load, file check and stat runs on the playlist thread, so switching tracks
+    never stalls a frame. The following track is always queued with mixer.music.queue,
+    which makes the end of one track flow into the next without a gap.
+
+    mode 'gapless' switches tracks straight away when skipping; 'crossfade' fades the
+    old track out and the new one in over crossfade_ms (mixer.music is a single stream,
+    so the two fades follow each other rather than overlap).
+    """
+
+    def __init__(self, mode='gapless', crossfade_ms=1500, volume=0.3, on_unavailable=None, poll_ms=100):
+        self.mode = mode
+        self.crossfade_ms = crossfade_ms
+        self.volume = volume
+        self.on_unavailable = on_unavailable  # Called on the playlist thread when nothing can play
+        self.poll_seconds = poll_ms / 1000
+
+        self.tracks = []  # Paths that passed the file check
+        self.metadata = {}  # Path -> {'size_bytes', 'modified'}
+        self.index = 0
+        self.current = None  # Path of the playing track
+        self.queued = None  # Path handed to mixer.music.queue
+        self.last_pos = -1
+
+        self.commands = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name='music-playlist', daemon=True)
+        self.thread.start()
+
+        # Statistics
+        self.transitions = []  # One dict per track change, newest last
+        self.max_transitions = 100
+
+    # Requests from the game, all non-blocking
+
+    def set_tracks(self, paths):
+        self.commands.put(('set_tracks', list(paths), time.perf_counter()))
+
+    def play(self, path=None):
+        """Play a specific file (looping) or the playlist from the current index"""
+        self.commands.put(('play', path, time.perf_counter()))
+
+    def skip(self, step=1):
+        self.commands.put(('skip', step, time.perf_counter()))
+
+    def stop(self):
+        self.commands.put(('stop', None, time.perf_counter()))
+
+    def shutdown(self):
+        self.commands.put(('quit', None, time.perf_counter()))
+        self.thread.join(timeout=1)
+
+    # Playlist thread
+
+    def run(self):
+        while True:
+            try:
+                command, argument, requested = self.commands.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                self.check_track_change()
+                continue
+            if command == 'quit':
+                return
+            try:
+                getattr(self, 'do_' + command)(argument, requested)
+            except Exception as e:
+                print(f"Music playlist {command} failed: {e}")
+
+    def do_set_tracks(self, paths, requested):
+        tracks = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                print(f"Music file not found: {path}")
+                continue
+            self.metadata[path] = {'size_bytes': stat.st_size, 'modified': stat.st_mtime}
+            tracks.append(path)
+        self.tracks = tracks
+        self.index = min(self.index, max(0, len(tracks) - 1))
+
+    def do_play(self, path, requested):
+        if path is not None:
+            if not os.path.exists(path):
+                print(f"Music file not found: {path}")
+                self.unavailable()
+                return
+            self.start(path, requested, loops=-1)
+            return
+        if not self.tracks:
+            self.unavailable()
+            return
+        self.start(self.tracks[self.index], requested)
+
+    def do_skip(self, step, requested):
+        if not self.tracks:
+            self.unavailable()
+            return
+        self.index = (self.index + step) % len(self.tracks)
+        self.start(self.tracks[self.index], requested)
+
+    def do_stop(self, argument, requested):
+        pygame.mixer.music.stop()
+        self.current = self.queued = None
+
+    def start(self, path, requested, loops=None):
+        """Switch to path and queue the track after it"""
+        previous = self.current
+        fade_ms = 0
+        if self.mode == 'crossfade' and previous is not None and pygame.mixer.music.get_busy():
+            fade_ms = self.crossfade_ms
+            pygame.mixer.music.fadeout(fade_ms)
+            time.sleep(fade_ms / 1000)
+
+        # A single track loops by itself; a playlist moves on to the queued track
+        if loops is None:
+            loops = -1 if len(self.tracks) == 1 else 0
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops, fade_ms=fade_ms)
+        self.current = path
+        self.queued = None
+        self.last_pos = -1
+        if loops == 0:
+            self.queue_next()
+        self.record(previous, path, requested, fade_ms)
+
+    def queue_next(self):
+        path = self.tracks[(self.index + 1) % len(self.tracks)]
+        pygame.mixer.music.queue(path)
+        self.queued = path
+
+    def check_track_change(self):
+        """Spot the queued track taking over (its position restarts) and queue the one after"""
+        if self.current is None:
+            return
+        pos = pygame.mixer.music.get_pos()
+        if self.queued is not None and 0 <= pos < self.last_pos:
+            previous = self.current
+            self.index = (self.index + 1) % len(self.tracks)
+            self.current = self.queued
+            self.queue_next()
+            self.record(previous, self.current, None, 0)
+        self.last_pos = pos
+
+    def unavailable(self):
+        pygame.mixer.music.stop()
+        self.current = self.queued = None
+        if self.on_unavailable:
+            self.on_unavailable()
+
+    def record(self, previous, path, requested, fade_ms):
+        """Log a transition; latency is from the request to the new track playing"""
+        self.transitions.append({
+            'from': previous and os.path.basename(previous),
+            'to': os.path.basename(path),
+            'mode': 'queued' if requested is None else self.mode,
+            'fade_ms': fade_ms,
+            'latency_ms': 0.0 if requested is None else (time.perf_counter() - requested) * 1000
+        })
+        if len(self.transitions) > self.max_transitions:
+            del self.transitions[0]
+
+    def get_stats(self):
+        latencies = [t['latency_ms'] for t in self.transitions if t['mode'] != 'queued']
+        return {
+            'tracks': len(self.tracks),
+            'current': self.current and os.path.basename(self.current),
+            'queued': self.queued and os.path.basename(self.queued),
+            'transitions': len(self.transitions),
+            'last_transition_ms': latencies[-1] if latencies else None,
+            'max_transition_ms': max(latencies) if latencies else None
+        }
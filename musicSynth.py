@@ -0,0 +1,115 @@
+import threading
+from collections import deque
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=64)
+def tone_samples(frequency, duration, sample_rate=44100, channels=2):
+    """Sine tone as an int16 (samples, channels) array, synthesized once per (frequency, duration, rate)
+
+    The array is shared between callers, so it is read-only; make_sound copies it.
+    """
+    # NumPy is imported on first use so importing the audio modules stays cheap
+    import numpy as np
+    samples = int(sample_rate * duration / 1000)
+    t = np.linspace(0, duration / 1000, samples)
+    wave = np.sin(2 * np.pi * frequency * t) * 0.3
+    tone = np.repeat((wave * 32767).astype(np.int16)[:, None], channels, axis=1)
+    tone.flags.writeable = False
+    return tone
+
+
+class PatternSynth:
+    """Renders a looping note pattern ({'frequencies', 'duration', 'sample_rate'}) in chunks"""
+
+    def __init__(self, pattern, sample_rate=44100, channels=2, volume=0.3, fade_ms=5):
+        import numpy as np
+        self.frequencies = np.array(pattern['frequencies'], dtype=np.float64)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.volume = volume
+
+        # The pattern's duration covers every note once
+        self.note_samples = int(sample_rate * pattern['duration'] / 1000 / len(self.frequencies))
+        self.fade_samples = max(1, int(sample_rate * fade_ms / 1000))
+        self.position = 0  # Next sample to render
+
+    def render(self, samples):
+        """The next chunk of the looped pattern as an int16 (samples, channels) array"""
+        import numpy as np
+        index = np.arange(self.position, self.position + samples)
+        self.position += samples
+
+        note = (index // self.note_samples) % len(self.frequencies)
+        offset = index % self.note_samples  # Sample within the current note
+        wave = np.sin(2 * np.pi * self.frequencies[note] * offset / self.sample_rate)
+
+        # Short fade in/out per note so note changes don't click
+        envelope = np.minimum(1.0, np.minimum(offset, self.note_samples - 1 - offset) / self.fade_samples)
+        wave *= envelope * self.volume
+        return np.repeat((wave * 32767).astype(np.int16)[:, None], self.channels, axis=1)
+
+
+class MusicStream:
+    """Plays a PatternSynth gaplessly on one mixer channel from a background thread
+
+    The thread keeps a small ring of pre-rendered chunks and hands the next one to
+    Channel.queue whenever the channel's queue slot frees up, so memory stays at
+    a few chunks and the main thread does nothing.
+    """
+
+    def __init__(self, synth, channel, chunk_ms=250, buffers=3):
+        self.synth = synth
+        self.channel = channel
+        self.chunk_samples = int(synth.sample_rate * chunk_ms / 1000)
+        self.poll_seconds = chunk_ms / 4000
+        self.buffers = buffers
+        self.stopped = threading.Event()
+        self.thread = None
+
+        # Statistics
+        self.chunks_rendered = 0
+        self.underruns = 0  # Times the channel ran dry and playback had to restart
+
+    def start(self):
+        if self.thread is not None and self.stopped.is_set():
+            self.thread.join()  # Still winding down from stop()
+            self.thread = None
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name='music-stream', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Ask the thread to stop; it silences the channel itself, so this doesn't wait"""
+        self.stopped.set()
+        self.channel.stop()
+
+    def run(self):
+        ring = deque()
+        started = False
+        while not self.stopped.is_set():
+            # Keep the ring full
+            while len(ring) < self.buffers:
+                ring.append(pygame.sndarray.make_sound(self.synth.render(self.chunk_samples)))
+                self.chunks_rendered += 1
+
+            if not self.channel.get_busy():
+                if started:
+                    self.underruns += 1
+                self.channel.play(ring.popleft())
+                started = True
+            elif self.channel.get_queue() is None:
+                self.channel.queue(ring.popleft())
+            else:
+                self.stopped.wait(self.poll_seconds)
+        self.channel.stop()
+
+    def get_stats(self):
+        return {
+            'chunks_rendered': self.chunks_rendered,
+            'underruns': self.underruns,
+            'buffered_bytes': self.buffers * self.chunk_samples * self.synth.channels * 2
+        }
@@ -0,0 +1,103 @@
+import gc
+
+
+class ObjectPool:
+    """Free list for one entity class: released objects are re-initialized instead of reallocated
+
+    acquire() takes the class's constructor arguments. Objects with a retire() method
+    (WorldEntity) get it called on release so their world slot is freed right away.
+    """
+
+    def __init__(self, cls, max_free=256):
+        self.cls = cls
+        self.max_free = max_free  # Released objects kept beyond this are left to the GC
+        self.free = []
+
+        # Statistics
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self.high_water = 0  # Most objects in use at once
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.__init__(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        retire = getattr(obj, 'retire', None)
+        if retire is not None:
+            retire()
+        self.in_use -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def release_all(self, objects):
+        for obj in objects:
+            self.release(obj)
+
+    def get_stats(self):
+        return {
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'high_water': self.high_water,
+            'created': self.created,
+            'reused': self.reused
+        }
+
+
+class GcPolicy:
+    """Keeps the cyclic GC out of gameplay frames
+
+    mode None leaves the GC alone. 'freeze' collects once and moves everything alive
+    into the permanent generation, so later collections only look at new objects.
+    'tune' does the same and also raises the thresholds so collections are rarer.
+    checkpoint() is meant for natural pauses such as level changes.
+    """
+
+    def __init__(self, mode=None, thresholds=(50000, 50, 100)):
+        self.mode = mode
+        self.thresholds = thresholds
+        self.saved_thresholds = None
+        self.start_collections = None
+
+    def start(self):
+        if self.mode is None or self.saved_thresholds is not None:
+            return
+        self.saved_thresholds = gc.get_threshold()
+        self.start_collections = [stats['collections'] for stats in gc.get_stats()]
+        if self.mode == 'tune':
+            gc.set_threshold(*self.thresholds)
+        self.checkpoint()
+
+    def checkpoint(self):
+        """Collect now and freeze what survives"""
+        if self.saved_thresholds is None:
+            return
+        gc.collect()
+        gc.freeze()
+
+    def stop(self):
+        if self.saved_thresholds is None:
+            return
+        gc.unfreeze()
+        gc.set_threshold(*self.saved_thresholds)
+        self.saved_thresholds = None
+
+    def get_stats(self):
+        """Collections per generation since start()"""
+        collections = [stats['collections'] for stats in gc.get_stats()]
+        start = self.start_collections or [0] * len(collections)
+        return {
+            'mode': self.mode,
+            'frozen': gc.get_freeze_count(),
+            'collections': [now - before for now, before in zip(collections, start)]
+        }
@@ -0,0 +1,135 @@
+import pygame
+import numpy as np
+
+
+class ParticlePool:
+    """Fixed-capacity particle system stored as NumPy arrays (one per field)"""
+
+    def __init__(self, capacity=65536, seed=None):
+        self.capacity = capacity
+        self.count = 0  # Live particles are always packed into [0, count)
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.max_life = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.fields = [self.x, self.y, self.dx, self.dy, self.size, self.life, self.max_life, self.color]
+
+        # Statistics
+        self.dropped = 0  # Particles not emitted because the pool was full
+
+        self.circle_offsets = {}  # radius -> (dx, dy) pixel offsets of a filled circle
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Kill every particle"""
+        self.count = 0
+
+    def emit(self, amount, x, y, width, height, color):
+        """Spawn a batch of particles at random spots inside a rectangle"""
+        room = self.capacity - self.count
+        if amount > room:
+            self.dropped += amount - room
+            amount = room
+        if amount <= 0:
+            return
+        start = self.count
+        end = start + amount
+
+        self.x[start:end] = x + self.rng.integers(0, width + 1, amount)
+        self.y[start:end] = y + self.rng.integers(0, height + 1, amount)
+        self.dx[start:end] = self.rng.uniform(-2, 2, amount)
+        self.dy[start:end] = self.rng.uniform(-2, 2, amount)
+        self.size[start:end] = self.rng.integers(2, 7, amount)
+        self.life[start:end] = self.rng.integers(20, 41, amount)
+        self.max_life[start:end] = self.life[start:end]
+        self.color[start:end] = color
+        self.count = end
+
+    def update(self):
+        """Move every particle one step and drop the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.life[:n] -= 1
+        np.maximum(self.size[:n] - 0.1, 0, out=self.size[:n])
+
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if dead.size == 0:
+            return
+
+        # Swap-compact: live particles from the tail fill the holes at the front
+        alive_count = n - dead.size
+        holes = dead[dead < alive_count]
+        movers = alive_count + np.flatnonzero(self.life[alive_count:n] > 0)
+        for field in self.fields:
+            field[holes] = field[movers]
+        self.count = alive_count
+
+    def get_circle_offsets(self, radius):
+        """Pixel offsets covered by a filled circle of the given radius"""
+        offsets = self.circle_offsets.get(radius)
+        if offsets is None:
+            dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+            inside = dx * dx + dy * dy <= radius * radius
+            offsets = (dx[inside], dy[inside])
+            self.circle_offsets[radius] = offsets
+        return offsets
+
+    def draw(self, surface):
+        """Draw every particle and return the area they cover (or None)"""
+        n = self.count
+        if n == 0:
+            return None
+        radius = self.size[:n].astype(np.int32)
+        visible = radius > 0
+        if not visible.any():
+            return None
+
+        cx = self.x[:n].astype(np.int32)
+        cy = self.y[:n].astype(np.int32)
+        width, height = surface.get_size()
+
+        pixel_type = {2: np.uint16, 4: np.uint32}.get(surface.get_bytesize())
+        if pixel_type is None:
+            # 8 and 24-bit surfaces can't be written as packed pixels, draw one by one
+            for i in np.flatnonzero(visible):
+                pygame.draw.circle(surface, self.color[i], (int(cx[i]), int(cy[i])), int(radius[i]))
+        else:
+            # Pack colours into the surface's pixel format in one go
+            shifts = surface.get_shifts()
+            losses = surface.get_losses()
+            colors = self.color[:n].astype(np.uint32)
+            mapped = np.uint32(surface.get_masks()[3])  # Fully opaque if the surface has alpha
+            for channel in range(3):
+                mapped = mapped | ((colors[:, channel] >> losses[channel]) << shifts[channel])
+            mapped = mapped.astype(pixel_type)
+
+            # Write straight into the pixel buffer, one scatter per radius
+            buffer = surface.get_buffer()
+            pixels = np.frombuffer(buffer, dtype=pixel_type)
+            row_length = surface.get_pitch() // surface.get_bytesize()
+            for r in np.unique(radius[visible]):
+                index = np.flatnonzero(radius == r)
+                offset_x, offset_y = self.get_circle_offsets(int(r))
+                px = (cx[index, None] + offset_x).ravel()
+                py = (cy[index, None] + offset_y).ravel()
+                values = np.broadcast_to(mapped[index, None], (index.size, offset_x.size)).ravel()
+                on_screen = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                pixels[py[on_screen] * row_length + px[on_screen]] = values[on_screen]
+            del pixels, buffer  # Unlock the surface
+
+        left = int((cx - radius)[visible].min())
+        top = int((cy - radius)[visible].min())
+        right = int((cx + radius)[visible].max()) + 1
+        bottom = int((cy + radius)[visible].max()) + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
@@ -0,0 +1,80 @@
+import math
+
+
+class SpatialGrid:
+    """Uniform-grid broad phase for axis-aligned objects with x, y, width, height"""
+
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self.cells = {}    # (column, row) -> indices of the objects touching that cell
+        self.objects = []  # Index -> object, in insertion order
+
+    def clear(self):
+        """Remove every object from the grid"""
+        self.cells.clear()
+        self.objects = []
+
+    def cell_range(self, x, y, width, height):
+        """Columns and rows covered by a rectangle"""
+        size = self.cell_size
+        # Right and bottom edges are exclusive, and coordinates can be floats
+        columns = range(int(x // size), math.ceil((x + width) / size))
+        rows = range(int(y // size), math.ceil((y + height) / size))
+        return columns, rows
+
+    def insert(self, obj):
+        """Add an object and return its index"""
+        index = len(self.objects)
+        self.objects.append(obj)
+        size = self.cell_size
+        cells = self.cells
+        first_column = int(obj.x // size)
+        first_row = int(obj.y // size)
+        last_column = math.ceil((obj.x + obj.width) / size) - 1
+        last_row = math.ceil((obj.y + obj.height) / size) - 1
+
+        # Most sprites are smaller than a cell and land in a single one
+        if first_column == last_column and first_row == last_row:
+            cells.setdefault((first_column, first_row), []).append(index)
+            return index
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cells.setdefault((column, row), []).append(index)
+        return index
+
+    def rebuild(self, objects):
+        """Re-index a whole list of objects (indices match the list positions)"""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def query_rect(self, x, y, width, height):
+        """Indices of objects sharing a cell with the rectangle, in insertion order"""
+        cells = self.cells
+        found = set()
+        columns, rows = self.cell_range(x, y, width, height)
+        for column in columns:
+            for row in rows:
+                cell = cells.get((column, row))
+                if cell:
+                    found.update(cell)
+        return sorted(found)
+
+    def query_point(self, x, y):
+        """Indices of objects whose cell contains the point"""
+        cell = self.cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        return list(cell) if cell else []
+
+    def query_object(self, obj):
+        """Indices of objects that might overlap another object"""
+        return self.query_rect(obj.x, obj.y, obj.width, obj.height)
+
+    def candidate_pairs(self):
+        """Index pairs (i < j) that share at least one cell, for n-vs-n checks"""
+        pairs = set()
+        for cell in self.cells.values():
+            count = len(cell)
+            for a in range(count):
+                for b in range(a + 1, count):
+                    pairs.add((cell[a], cell[b]))
+        return sorted(pairs)
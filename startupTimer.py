@@ -0,0 +1,36 @@
+import time
+
+
+class StartupTimer:
+    """Breaks the time from launch to a fully set-up game into named stages"""
+
+    def __init__(self):
+        self.start = self.last_mark = time.perf_counter()
+        self.stages = []  # (name, milliseconds) in order
+        self.finished = False
+        self.owner = None  # The game whose startup is being timed (see Game.mark_startup)
+
+    def mark(self, stage):
+        """Close a stage: everything since the previous mark is charged to it"""
+        if self.finished:
+            return
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self.last_mark) * 1000))
+        self.last_mark = now
+
+    def total_ms(self):
+        return (self.last_mark - self.start) * 1000
+
+    def finish(self, report=True):
+        """Stop recording (later marks are ignored) and print the breakdown"""
+        if self.finished:
+            return
+        self.finished = True
+        if report:
+            print(f"Startup took {self.total_ms():.0f}ms:")
+            for stage, ms in self.stages:
+                print(f"    {stage:<14} {ms:7.1f}ms")
+
+
+# Created by the first import, so importing this before anything else times the imports too
+startup_timer = StartupTimer()
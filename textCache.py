@@ -0,0 +1,73 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextCache:
+    """Font registry plus a cache of rendered text surfaces"""
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes  # Pixel memory budget for rendered text
+        self.fonts = {}  # (font_name, size) -> Font
+        self.surfaces = OrderedDict()  # (font_name, size, text, color, antialias) -> Surface
+        self.surface_bytes = {}  # Same keys -> pixel bytes of the surface
+        self.total_bytes = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, size, font_name=None):
+        """Return a shared Font object, creating it on first use"""
+        key = (font_name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(font_name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, antialias=True, font_name=None):
+        """Return a rendered text surface, re-rendering only on a miss"""
+        color = tuple(color)
+        key = (font_name, size, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)  # Mark as most recently used
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, font_name).render(text, antialias, color)
+        nbytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.surfaces[key] = surface
+        self.surface_bytes[key] = nbytes
+        self.total_bytes += nbytes
+
+        # Evict least recently used text until we fit the budget again
+        while self.total_bytes > self.max_bytes and len(self.surfaces) > 1:
+            old_key, _ = self.surfaces.popitem(last=False)
+            self.total_bytes -= self.surface_bytes.pop(old_key)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Forget every rendered surface (fonts are kept)"""
+        self.surfaces.clear()
+        self.surface_bytes.clear()
+        self.total_bytes = 0
+
+    def get_stats(self):
+        """Get cache size and hit/miss counters"""
+        return {
+            'fonts': len(self.fonts),
+            'entries': len(self.surfaces),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+# Shared by the HUD and every Button
+text_cache = TextCache()
@@ -0,0 +1,141 @@
+class Timer:
+    """One scheduled callback; keep it to cancel() or ask the wheel how long is left"""
+    __slots__ = ('deadline', 'priority', 'callback', 'args', 'slot', 'active')
+
+    def __init__(self, deadline, priority, callback, args):
+        self.deadline = deadline
+        self.priority = priority
+        self.callback = callback
+        self.args = args
+        self.slot = None  # The wheel slot (dict) holding the timer
+        self.active = True
+
+
+class TimingWheel:
+    """Hierarchical timing wheel counting in ticks
+
+    Level 0 has one slot per tick for the next 2**slot_bits ticks, each level above
+    covers 2**slot_bits times the span of the one below. schedule() and cancel() are
+    O(1); tick() only touches the timers that fire, plus the ones cascading down from
+    a higher level when a lower level wraps around (once per timer per level).
+    """
+
+    def __init__(self, levels=4, slot_bits=6):
+        self.levels = levels
+        self.slot_bits = slot_bits
+        self.mask = (1 << slot_bits) - 1
+        # Slots are dicts used as ordered sets, so timers fire in the order they were scheduled
+        self.wheels = [[{} for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.overflow = {}  # Further out than the top level reaches
+        self.now = 0
+
+        # Statistics
+        self.pending = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.cascaded = 0
+
+    def schedule(self, delay, callback, *args, priority=0):
+        """Call callback(*args) delay ticks from now (at least one)
+
+        Timers due on the same tick fire by priority (lowest first), then in the order
+        they were scheduled.
+        """
+        timer = Timer(self.now + max(1, delay), priority, callback, args)
+        self.place(timer)
+        self.pending += 1
+        return timer
+
+    def cancel(self, timer):
+        if timer is None or not timer.active:
+            return
+        timer.active = False
+        timer.slot.pop(timer, None)
+        timer.slot = None
+        self.pending -= 1
+        self.cancelled += 1
+
+    def remaining(self, timer):
+        """Ticks until the timer fires (0 once it has fired or been cancelled)"""
+        if timer is None or not timer.active:
+            return 0
+        return timer.deadline - self.now
+
+    def place(self, timer):
+        delay = timer.deadline - self.now
+        for level in range(self.levels):
+            if delay < 1 << (self.slot_bits * (level + 1)):
+                slot = self.wheels[level][(timer.deadline >> (self.slot_bits * level)) & self.mask]
+                break
+        else:
+            slot = self.overflow
+        slot[timer] = None
+        timer.slot = slot
+
+    def cascade(self, level):
+        """Move the timers of the level's current slot down to where they belong now"""
+        slot = self.wheels[level][(self.now >> (self.slot_bits * level)) & self.mask]
+        if not slot:
+            return
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            self.place(timer)
+        self.cascaded += len(timers)
+
+    def tick(self):
+        """Advance one tick and fire the timers that are due"""
+        self.now += 1
+        now = self.now
+
+        # When a level wraps, the next slot of the level above comes due; work from the top down
+        if not now & self.mask:
+            wrapped = 1
+            while wrapped < self.levels and not now & ((1 << (self.slot_bits * (wrapped + 1))) - 1):
+                wrapped += 1
+            if wrapped == self.levels and self.overflow:
+                timers = list(self.overflow)
+                self.overflow.clear()
+                for timer in timers:
+                    self.place(timer)
+            for level in range(min(wrapped, self.levels - 1), 0, -1):
+                self.cascade(level)
+
+        slot = self.wheels[0][now & self.mask]
+        if not slot:
+            return
+        due = list(slot)
+        slot.clear()
+        if len(due) > 1:
+            due.sort(key=lambda timer: timer.priority)
+        for timer in due:
+            # A callback earlier in the list may have cancelled this one
+            if timer.active:
+                timer.active = False
+                timer.slot = None
+                self.pending -= 1
+                self.fired += 1
+                timer.callback(*timer.args)
+
+    def clear(self):
+        """Cancel everything"""
+        for wheel in self.wheels:
+            for slot in wheel:
+                for timer in slot:
+                    timer.active = False
+                    timer.slot = None
+                slot.clear()
+        for timer in self.overflow:
+            timer.active = False
+            timer.slot = None
+        self.overflow.clear()
+        self.pending = 0
+
+    def get_stats(self):
+        return {
+            'now': self.now,
+            'pending': self.pending,
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+            'cascaded': self.cascaded
+        }
@@ -0,0 +1,160 @@
+import time
+
+import pygame
+
+
+class SoundSpec:
+    """Playback rules for one sound name"""
+
+    def __init__(self, priority=1, max_instances=4, max_per_frame=2, ui=False):
+        self.priority = priority  # Higher priorities steal voices from lower ones
+        self.max_instances = max_instances  # Voices of this sound playing at once
+        self.max_per_frame = max_per_frame  # New starts per frame, extra requests are dropped
+        self.ui = ui  # Plays on the reserved UI channels instead of the shared pool
+
+
+class Voice:
+    """What a channel is playing, for choosing which one to steal"""
+
+    def __init__(self, name, sound, priority, started):
+        self.name = name
+        self.sound = sound
+        self.priority = priority
+        self.started = started
+
+
+class VoiceManager:
+    """Fixed pool of mixer channels shared by every sound effect
+
+    Channel 0 (and up) is reserved for music, the next ones for UI cues; gameplay
+    sounds get the rest. When the pool is full a new sound steals the oldest voice
+    of the lowest priority, as long as that priority isn't higher than its own.
+    """
+
+    def __init__(self, pool_channels=12, music_channels=1, ui_channels=1, frame_ms=1000 / 60):
+        self.pool_size = pool_channels
+        self.music_size = music_channels
+        self.ui_size = ui_channels
+        self.frame_ms = frame_ms
+
+        self.specs = {}
+        self.default_spec = SoundSpec()
+        self.music_channels = []
+        self.ui_channels = []
+        self.pool = []
+        self.voices = {}  # Channel -> Voice
+
+        self.frame_start = None  # perf_counter milliseconds, like Voice.started
+        self.frame_counts = {}  # Sound name -> starts in the current frame
+        self.frame_driven = False  # begin_frame() is being called, so frames aren't timed
+
+        # Statistics
+        self.played = 0
+        self.dropped = 0  # Rate limited or no voice could be freed
+        self.stolen = 0  # Voices cut short for a new sound
+
+    def setup(self):
+        """Claim the channels; done on first use since it needs an initialized mixer"""
+        if self.pool:
+            return
+        reserved = self.music_size + self.ui_size
+        pygame.mixer.set_num_channels(reserved + self.pool_size)
+        pygame.mixer.set_reserved(reserved)  # Sound.play() never picks these
+        channels = [pygame.mixer.Channel(i) for i in range(reserved + self.pool_size)]
+        self.music_channels = channels[:self.music_size]
+        self.ui_channels = channels[self.music_size:reserved]
+        self.pool = channels[reserved:]
+
+    @property
+    def music_channel(self):
+        self.setup()
+        return self.music_channels[0]
+
+    def configure(self, name, **rules):
+        """Set the SoundSpec rules (priority, max_instances, max_per_frame, ui) for a sound"""
+        self.specs[name] = SoundSpec(**rules)
+
+    def begin_frame(self):
+        """Reset the per-frame limits once per rendered frame; until the first call,
+        frames are approximated as frame_ms windows"""
+        self.frame_driven = True
+        self.frame_start = time.perf_counter() * 1000
+        self.frame_counts.clear()
+
+    def play(self, name, sound, **kwargs):
+        """Play sound under name's rules; returns the channel or None if it was dropped"""
+        self.setup()
+        spec = self.specs.get(name, self.default_spec)
+
+        now = time.perf_counter() * 1000
+        if not self.frame_driven and (self.frame_start is None or now - self.frame_start >= self.frame_ms):
+            self.frame_start = now
+            self.frame_counts.clear()
+        if self.frame_counts.get(name, 0) >= spec.max_per_frame:
+            self.dropped += 1
+            return None
+
+        channels = self.ui_channels if spec.ui else self.pool
+        channel = self.pick_channel(name, spec, channels)
+        if channel is None:
+            self.dropped += 1
+            return None
+
+        channel.play(sound, **kwargs)
+        self.voices[channel] = Voice(name, sound, spec.priority, now)
+        self.frame_counts[name] = self.frame_counts.get(name, 0) + 1
+        self.played += 1
+        return channel
+
+    def active_voice(self, channel):
+        """The voice on a channel, or None once it finished"""
+        voice = self.voices.get(channel)
+        if voice is not None and channel.get_busy() and channel.get_sound() is voice.sound:
+            return voice
+        return None
+
+    def pick_channel(self, name, spec, channels):
+        """A free channel, or one to steal from; None if nothing may be interrupted"""
+        free = None
+        instances = []
+        candidates = []
+        for channel in channels:
+            voice = self.active_voice(channel)
+            if voice is None:
+                if free is None:
+                    free = channel
+                continue
+            candidates.append((voice.priority, voice.started, channel))
+            if voice.name == name:
+                instances.append((voice.started, channel))
+
+        # Too many copies of this sound: restart the oldest one
+        if instances and len(instances) >= spec.max_instances:
+            self.stolen += 1
+            return min(instances, key=lambda item: item[0])[1]
+        if free is not None:
+            return free
+        if not candidates:
+            return None
+
+        # Oldest of the lowest priority
+        priority, _, channel = min(candidates, key=lambda item: (item[0], item[1]))
+        if priority > spec.priority:
+            return None
+        self.stolen += 1
+        return channel
+
+    def get_stats(self):
+        """Get voice counters"""
+        self.setup()
+        return {
+            'pool_channels': len(self.pool),
+            'active': sum(1 for channel in self.pool + self.ui_channels if self.active_voice(channel)),
+            'played': self.played,
+            'dropped': self.dropped,
+            'stolen': self.stolen
+        }
+
+
+# One pool for the whole game; Music and SoundEffect both play through it
+voice_manager = VoiceManager()